@@ -4,13 +4,34 @@ import requests
 from openai import OpenAI
 from dotenv import load_dotenv
 import json
-from main import search_news
+from http_client import HttpClient
+from llm_pipeline import AnalysisStream
+from result_cache import ResultCache, content_key
 
 # 환경변수 로드
 load_dotenv()
 
 # FastAPI 서버 URL (환경변수로 설정 가능)
-FASTAPI_URL = "http://localhost:8000"
+FASTAPI_URL = os.getenv("FASTAPI_URL", "http://localhost:8000")
+
+# FastAPI 호출 타임아웃 (연결, 응답 사이 간격) 초
+API_TIMEOUT = (
+    float(os.getenv("FASTAPI_CONNECT_TIMEOUT", "3")),
+    float(os.getenv("FASTAPI_READ_TIMEOUT", "60")),
+)
+
+# 같은 (검색어, 기사 수) 결과를 다시 긁지 않고 재사용하는 시간(초)
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "300"))
+
+# LLM 분석 설정 (뉴스 JSON을 이 토큰 수 단위로 묶어서 분석)
+LLM_MODEL = "gpt-4o-mini"
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", "6000"))
+LLM_ARTICLE_TOKENS = int(os.getenv("LLM_ARTICLE_TOKENS", "1500"))
+STT_MODEL = "whisper-1"
+
+# 같은 분석/음성 변환 결과를 다시 요청하지 않도록 디스크에 저장 (크기 제한, 오래 안 쓴 것부터 삭제)
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "results.db")
+RESULT_CACHE_MAX_MB = float(os.getenv("RESULT_CACHE_MAX_MB", "100"))
 
 # OpenAI 클라이언트 초기화
 @st.cache_resource
@@ -22,50 +43,169 @@ def get_openai_client():
     return OpenAI(api_key=api_key)
 
 
-def get_news_articles(query: str, display: int = 10):
+# LLM/STT 결과 캐시 (모든 세션이 같이 씀)
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(RESULT_CACHE_PATH, max_bytes=int(RESULT_CACHE_MAX_MB * 1024 * 1024))
+
+
+def analysis_key(news_list, prompt):
+    # 묶음 크기가 바뀌면 결과도 달라지므로 키에 넣는다
+    params = {"chunk_tokens": LLM_CHUNK_TOKENS, "article_tokens": LLM_ARTICLE_TOKENS}
+    return content_key("analysis", LLM_MODEL, prompt, news_list, params)
+
+
+# FastAPI 서버용 HTTP 클라이언트 (모든 세션/재실행이 커넥션 풀 하나를 같이 씀)
+@st.cache_resource
+def get_api_client():
+    return HttpClient(
+        pool_size=int(os.getenv("FASTAPI_POOL_SIZE", "10")),
+        retries=int(os.getenv("FASTAPI_RETRIES", "2")),
+    )
+
+
+def stream_news_articles(query: str, display: int = 10):
+    """FastAPI /search/stream을 읽으면서 본문이 준비된 기사부터 하나씩 돌려준다 (rank 포함)"""
+    with get_api_client().get(
+        f"{FASTAPI_URL}/search/stream",
+        params={"query": query, "display": display},
+        stream=True,
+        timeout=API_TIMEOUT,
+    ) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.pop("type") == "article":
+                yield record
+
+
+# (query, display)별로 결과를 기억해서 재실행/다른 세션에서 같은 검색을 하면 서버를 다시 부르지 않는다.
+# _on_article은 밑줄로 시작해서 캐시 키에서 빠진다 (캐시에 없을 때만 도착하는 대로 호출됨).
+# 오류는 예외로 올려서 캐시되지 않게 한다.
+@st.cache_data(ttl=NEWS_CACHE_TTL, max_entries=200, show_spinner=False)
+def fetch_news_articles(query: str, display: int = 10, _on_article=None):
+    news_articles = []
+    for news in stream_news_articles(query, display):
+        news_articles.append(news)
+        if _on_article:
+            _on_article(news)
+    news_articles.sort(key=lambda news: news["rank"])
+    return [{k: v for k, v in news.items() if k != "rank"} for news in news_articles]
+
+
+def get_news_articles(query: str, display: int = 10, on_article=None):
     ################################################
     ######### 필수 과제 - 문제 2: fastapi를 호출한 검색결과 가져오기
-    news_articles = search_news(query, display)['articles']
-
-    return news_articles
+    # 기사가 도착할 때마다 on_article(news)를 호출하고, 끝나면 검색 순위대로 정렬해서 반환
+    try:
+        return fetch_news_articles(query.strip(), int(display), _on_article=on_article)
+    except requests.RequestException as e:
+        st.error(f"FastAPI 서버 오류: {str(e)}")
+        return []
     ################################################
 
 
-def generate_with_openai(news_list, prompt):
-    
+def show_news(news):
+    with st.expander(f"{news['title']}"):
+        st.write(f"링크: {news['link']}")
+        st.write(f"본문: {news['text']}")
+
+
+def stream_with_openai(news_list, prompt):
+    """뉴스 목록을 LLM으로 분석: 받은 텍스트 조각을 바로 화면에 출력하고 통계를 돌려준다
+
+    뉴스 데이터를 compact JSON 묶음으로 나눠서 분석한다 (길면 묶음별 분석 후 합치기, 마지막 호출만 스트리밍).
+    """
+    cache = get_result_cache()
+    key = analysis_key(news_list, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        st.markdown(cached)
+        return {"cached": True}
+
     client = get_openai_client()
     if not client:
         return None
-    
-    # 뉴스 데이터를 JSON 문자열로 변환
-    news_json = json.dumps(news_list, ensure_ascii=False, indent=2)
-    
+
+    analysis = AnalysisStream(
+        client,
+        news_list,
+        prompt,
+        model=LLM_MODEL,
+        chunk_tokens=LLM_CHUNK_TOKENS,
+        article_tokens=LLM_ARTICLE_TOKENS,
+    )
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": news_json}
-            ]
-        )
-        return response.choices[0].message.content
+        st.write_stream(analysis)
     except Exception as e:
         st.error(f"OpenAI API 오류: {str(e)}")
         return None
-    
+    finally:
+        # 사용자가 다른 버튼을 눌러 재실행되면 여기서 스트림을 끊어 남은 토큰 생성(비용)을 멈춘다
+        analysis.close()
+        if "seconds" in analysis.stats:
+            st.session_state.setdefault("llm_calls", []).append(analysis.stats)
+    # 끝까지 받은 결과만 저장 (중간에 끊긴 분석은 저장하지 않음)
+    if not analysis.stats.get("cancelled"):
+        cache.put(key, analysis.text)
+    return analysis.stats
+
+
+def show_llm_stats(stats):
+    if stats.get("cached"):
+        st.caption("저장된 분석 결과 (API 호출 없음)")
+        return
+    parts = []
+    if stats.get("ttft") is not None:
+        parts.append(f"첫 토큰 {stats['ttft']:.2f}초")
+    if stats.get("tokens_per_second") is not None:
+        parts.append(f"{stats['tokens_per_second']:.0f} tokens/s")
+    parts.append(f"전체 {stats['seconds']:.2f}초")
+    parts.append(f"호출 {stats['calls']}회 (입력 {stats['prompt_tokens']} / 출력 {stats['completion_tokens']} 토큰)")
+    st.caption(" · ".join(parts))
+
+
+
+def show_cache_stats():
+    """사이드바에 결과 캐시 적중률 표시 (서버 프로세스 시작 이후, 모든 세션 합계)"""
+    stats = get_result_cache().stats()
+    with st.sidebar:
+        st.subheader("결과 캐시")
+        for kind, label in (("analysis", "AI 분석"), ("stt", "음성 변환")):
+            counts = stats["kinds"].get(kind, {"hits": 0, "misses": 0})
+            total = counts["hits"] + counts["misses"]
+            st.metric(
+                f"{label} 적중률",
+                f"{counts['hits'] / total:.0%}" if total else "-",
+                help=f"적중 {counts['hits']}회 / 요청 {total}회",
+            )
+        st.caption(
+            f"저장 {stats['entries']}개, {stats['bytes'] / 1024 / 1024:.1f} / "
+            f"{stats['max_bytes'] / 1024 / 1024:.0f} MB, 삭제 {stats['evictions']}개"
+        )
 
 
 def transcribe_audio(audio_file):
     """오디오 파일을 텍스트로 변환 (STT)"""
+    # 재실행마다 같은 녹음이 다시 들어오므로 오디오 바이트 해시로 결과를 재사용
+    cache = get_result_cache()
+    key = content_key("stt", STT_MODEL, audio_file.getvalue())
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     client = get_openai_client()
     if not client:
         return None
     
     try:
         transcription = client.audio.transcriptions.create(
-            model="whisper-1",
+            model=STT_MODEL,
             file=audio_file
         )
+        cache.put(key, transcription.text)
         return transcription.text
     except Exception as e:
         st.error(f"STT 오류: {str(e)}")
@@ -99,9 +239,13 @@ with tab1:
         st.session_state.news_data = []
     
     if search_button and search_query:
-        with st.spinner("FastAPI 서버를 통해 뉴스를 검색하고 있습니다..."):
-            news_articles = get_news_articles(search_query, num_articles)
-            st.session_state.news_data = news_articles
+        # 도착하는 기사부터 바로 보여주고, 다 받으면 아래 검색 결과 영역으로 넘긴다
+        live = st.empty()
+        with live.container():
+            with st.spinner("FastAPI 서버를 통해 뉴스를 검색하고 있습니다..."):
+                news_articles = get_news_articles(search_query, num_articles, on_article=show_news)
+        live.empty()
+        st.session_state.news_data = news_articles
         
         if news_articles:
             st.success(f"✅ {len(news_articles)}개의 뉴스 기사를 찾았습니다!")
@@ -116,18 +260,17 @@ with tab1:
         ######### 필수 과제 - 문제 3: 검색결과 화면에 st.expander로 표시 및 LLM 프롬프팅 결과 출력        i = 1
         
         for news in st.session_state.news_data:
-            with st.expander(f"{news['title']}"):
-                st.write(f"링크: {news['link']}")
-                st.write(f"본문: {news['text']}")
+            show_news(news)
 
         st.header("AI 분석 요청")
         text_area = st.text_area("프롬프트를 입력하세요", height=100)
         analyze_button = st.button("AI 분석 실행", type="primary", use_container_width=True)
         if analyze_button:
+            st.header("AI 분석 결과")
             with st.spinner("뉴스를 분석하고 있습니다..."):
-                analysis = generate_with_openai(st.session_state.news_data, text_area)
-                st.header("AI 분석 결과")
-                st.write(analysis)
+                stats = stream_with_openai(st.session_state.news_data, text_area)
+            if stats:
+                show_llm_stats(stats)
 
         ################################################
         
@@ -154,16 +297,19 @@ with tab2:
             """)
             search_with_sst_result = st.button("이 텍스트로 뉴스 검색하기", icon="🎤")
             if search_with_sst_result:
-                with st.spinner("FastAPI 서버를 통해 뉴스를 검색하고 있습니다..."):
-                    news_articles = get_news_articles(stt_result, 5)
-                    st.session_state.news_data = news_articles
+                live = st.empty()
+                with live.container():
+                    with st.spinner("FastAPI 서버를 통해 뉴스를 검색하고 있습니다..."):
+                        news_articles = get_news_articles(stt_result, 5, on_article=show_news)
+                live.empty()
+                st.session_state.news_data = news_articles
                 if news_articles:
                     st.success(f"✅ {len(news_articles)}개의 뉴스 기사를 찾았습니다!")
             if st.session_state.news_data:
                 for news in st.session_state.news_data:
-                    with st.expander(f"{news['title']}"):
-                        st.write(f"링크: {news['link']}")
-                        st.write(f"본문: {news['text']}")
+                    show_news(news)
 
     ##################################################
 
+# 사이드바: 이번 실행의 적중까지 반영되도록 마지막에 그린다
+show_cache_stats()
@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# get()이 "캐시에 없음"을 나타낼 때 쓰는 값 (None은 "본문 없음"이라는 캐시된 결과)
+MISS = object()
+
+
+class ArticleCache:
+    """기사 URL -> 본문 TTL + 크기 제한 LRU 캐시 (스레드 안전)
+
+    본문은 리다이렉트가 끝난 최종 URL을 키로 저장하고, 요청 URL -> 최종 URL 별칭을 따로 둔다.
+    별칭은 그 요청 URL을 한 번 가져온 뒤에야 생기므로, ?sid= 같은 쿼리만 다른 링크는 처음에는 각자
+    한 번씩 요청된다. 같은 최종 URL로 가면 본문은 한 항목만 저장되고 그다음부터는 별칭으로 바로 찾는다.
+    """
+
+    def __init__(self, max_entries: int = 5000, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Optional[str]]] = OrderedDict()
+        self._aliases: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str):
+        """캐시된 본문(없으면 None일 수 있음) 또는 MISS"""
+        with self._lock:
+            final_url = self._aliases.get(url, url)
+            entry = self._entries.get(final_url)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(final_url)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, url: str, final_url: str, text: Optional[str]):
+        with self._lock:
+            self._entries[final_url] = (time.monotonic() + self.ttl, text)
+            self._entries.move_to_end(final_url)
+            if url != final_url:
+                self._aliases[url] = final_url
+                self._aliases.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            while len(self._aliases) > self.max_entries:
+                self._aliases.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,103 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# n.news.naver.com/mnews/article/003/0013553420, news.naver.com/article/003/0013553420
+_NAVER_ARTICLE_PATH = re.compile(r"/article/(\d+)/(\d+)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    text TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def article_key(url: str) -> str:
+    """네이버 기사 URL을 언론사 id(oid)/기사 id(aid)로 정규화 (sid 같은 쿼리는 무시)
+
+    네이버 기사 형식이 아니면 fragment만 뗀 URL을 그대로 키로 쓴다.
+    """
+    parts = urlsplit(url)
+    if "news.naver.com" in parts.netloc:
+        m = _NAVER_ARTICLE_PATH.search(parts.path)
+        if m:
+            return f"naver:{m.group(1)}/{m.group(2)}"
+        # 예전 형식: /main/read.naver?oid=003&aid=0013553420
+        query = parse_qs(parts.query)
+        if "oid" in query and "aid" in query:
+            return f"naver:{query['oid'][0]}/{query['aid'][0]}"
+    return parts._replace(fragment="").geturl()
+
+
+class StoredArticle(NamedTuple):
+    final_url: str
+    text: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def conditional_headers(self) -> dict:
+        """재검증용 조건부 GET 헤더"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ArticleStore:
+    """재시작해도 남는 기사 본문 저장소 (SQLite, 스레드 안전)
+
+    추출된 본문과 ETag/Last-Modified를 같이 저장해 두고,
+    다음에는 조건부 GET으로 바뀌었는지만 확인한다 (안 바뀌었으면 304, 파싱 생략).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[StoredArticle]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url, text, etag, last_modified, fetched_at FROM articles WHERE key = ?",
+                (article_key(url),),
+            ).fetchone()
+        return StoredArticle(*row) if row else None
+
+    def put(self, url: str, final_url: str, text: Optional[str], etag: Optional[str], last_modified: Optional[str]):
+        row = (final_url, text, etag, last_modified, time.time())
+        keys = dict.fromkeys([article_key(url), article_key(final_url)])
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles (key, final_url, text, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, *row) for key in keys],
+            )
+
+    def touch(self, url: str):
+        """304로 재검증된 기사의 확인 시각만 갱신"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE articles SET fetched_at = ? WHERE key = ?",
+                (time.time(), article_key(url)),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,5 @@
+# 저장소 루트의 common 패키지 (벤치마크 공용 함수)
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
@@ -0,0 +1,70 @@
+"""본문 추출 엔진 처리량 벤치마크
+
+bench/corpus 페이지들을 엔진마다 한 스레드(코어 하나)에서 반복 추출해
+초당 페이지 수와 페이지당 지연(p50/p99)을 잰다.
+
+    cd BeautifulSoup
+    python -m bench.bench_extract                  # 모든 엔진, 엔진당 3초
+    python -m bench.bench_extract --seconds 10 --engines lxml
+    python -m bench.bench_extract --repeat 20      # 페이지를 20번 이어 붙여 큰 기사처럼
+"""
+import argparse
+import time
+
+from bench.check_extract import load_corpus
+from common.stats import percentile
+from extractors import ENGINES
+
+
+def inflate(html: str, repeat: int) -> str:
+    """본문 영역(</body> 앞)을 repeat번 반복해서 실제 기사 크기에 가깝게 만든다"""
+    if repeat <= 1 or "</body>" not in html:
+        return html
+    head, _, tail = html.partition("</body>")
+    body_start = head.find("<body")
+    body_start = head.find(">", body_start) + 1 if body_start != -1 else 0
+    return head[:body_start] + head[body_start:] * repeat + "</body>" + tail
+
+
+def run(extract, pages, seconds):
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for html in pages:
+            start = time.perf_counter()
+            extract(html)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--seconds", type=float, default=3.0, help="엔진당 측정 시간")
+    parser.add_argument("--repeat", type=int, default=1, help="페이지 본문 반복 횟수")
+    args = parser.parse_args()
+
+    pages = [inflate(html, args.repeat) for html in load_corpus().values()]
+    size_kb = sum(len(html.encode("utf-8")) for html in pages) / len(pages) / 1024
+    print(f"corpus: {len(pages)} pages, 평균 {size_kb:.1f} KB, 엔진당 {args.seconds:.0f}초 (단일 스레드)")
+    print(f"{'engine':<8}{'pages/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+
+    results = {}
+    for name in args.engines:
+        extract = ENGINES[name]
+        run(extract, pages, 0.2)  # 워밍업
+        samples = run(extract, pages, args.seconds)
+        results[name] = len(samples) / sum(samples)
+        print(
+            f"{name:<8}{results[name]:>12.0f}"
+            f"{percentile(samples, 50) * 1000:>10.3f}{percentile(samples, 99) * 1000:>10.3f}"
+        )
+
+    if "bs4" in results and len(results) > 1:
+        for name, rate in results.items():
+            if name != "bs4":
+                print(f"{name}: bs4 대비 {rate / results['bs4']:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""뉴스 분석 LLM 호출 벤치마크 (가짜 OpenAI 서버 상대로 기존 단일 호출 vs map-reduce)
+
+- single:     예전 app.py 방식 (indent=2 JSON 전체를 메시지 하나로)
+- mapreduce:  llm_pipeline.analyze_news (compact JSON, 토큰 기준 묶음, 동시 map + reduce)
+- stream:     llm_pipeline.AnalysisStream (mapreduce와 같고 마지막 호출만 스트리밍, 첫 토큰까지 시간 비교)
+
+    cd BeautifulSoup
+    python -m bench.bench_llm                            # 기사 10개 x 본문 3000자
+    python -m bench.bench_llm --articles 30 --chars 6000 --chunk-tokens 4000
+
+openai 패키지가 필요하다. 비용은 gpt-4o-mini 단가(입력 $0.15 / 출력 $0.60, 100만 토큰당)로 계산한다.
+"""
+import argparse
+import json
+import time
+
+from openai import OpenAI
+
+from bench.bench_search import free_port, serve
+from llm_pipeline import AnalysisStream, analyze_news, count_tokens
+
+PRICE_IN = 0.15 / 1_000_000
+PRICE_OUT = 0.60 / 1_000_000
+
+PROMPT = "다음 뉴스 기사들을 읽고 핵심 이슈, 시장 영향, 전망을 한국어로 정리해 주세요."
+
+
+def make_news(n: int, chars: int) -> list[dict]:
+    sentence = "경기도에 사는 40대 A씨는 오래전 투자했던 비상장 주식의 존재를 잊고 지냈다. "
+    return [
+        {
+            "title": f"잊고 있던 미수령 주식 433억, 주인 찾았다 ({i})",
+            "link": f"https://n.news.naver.com/mnews/article/003/{i:010d}?sid=101",
+            "text": (sentence * (chars // len(sentence) + 1))[:chars],
+        }
+        for i in range(n)
+    ]
+
+
+def run_single(client, news, model):
+    """기존 방식 그대로"""
+    started = time.perf_counter()
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": PROMPT},
+            {"role": "user", "content": json.dumps(news, ensure_ascii=False, indent=2)},
+        ],
+    )
+    return {
+        "calls": 1,
+        "prompt_tokens": response.usage.prompt_tokens,
+        "completion_tokens": response.usage.completion_tokens,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--chars", type=int, default=3000, help="기사 하나 본문 글자 수")
+    parser.add_argument("--chunk-tokens", type=int, default=6000)
+    parser.add_argument("--article-tokens", type=int, default=1500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    args = parser.parse_args()
+
+    news = make_news(args.articles, args.chars)
+    indented = json.dumps(news, ensure_ascii=False, indent=2)
+    compact = json.dumps(news, ensure_ascii=False, separators=(",", ":"))
+    print(f"기사 {args.articles}개 x {args.chars}자: indent=2 JSON {count_tokens(indented)} 토큰, compact {count_tokens(compact)} 토큰")
+    print(f"{'mode':<11}{'calls':>6}{'in tok':>9}{'out tok':>9}{'cost $':>10}{'seconds':>9}")
+
+    with serve("bench.stub_openai:app", free_port(), {}) as url:
+        client = OpenAI(base_url=f"{url}/v1", api_key="stub", max_retries=0)
+        results = {"single": run_single(client, news, args.model)}
+        result = analyze_news(
+            client, news, PROMPT, model=args.model,
+            chunk_tokens=args.chunk_tokens, article_tokens=args.article_tokens, max_workers=args.workers,
+        )
+        results["mapreduce"] = result.stats
+        stream = AnalysisStream(
+            client, news, PROMPT, model=args.model,
+            chunk_tokens=args.chunk_tokens, article_tokens=args.article_tokens, max_workers=args.workers,
+        )
+        for _ in stream:
+            pass
+        results["stream"] = stream.stats
+
+    for mode, r in results.items():
+        cost = r["prompt_tokens"] * PRICE_IN + r["completion_tokens"] * PRICE_OUT
+        print(f"{mode:<11}{r['calls']:>6}{r['prompt_tokens']:>9}{r['completion_tokens']:>9}{cost:>10.5f}{r['seconds']:>9.2f}")
+    stats = results["mapreduce"]
+    print(f"mapreduce: 묶음 {stats['chunks']}개, reduce {stats['reduce_rounds']}단계, "
+          f"map {stats['map_seconds']:.2f}s + reduce {stats['reduce_seconds']:.2f}s")
+    stats = results["stream"]
+    print(f"첫 토큰까지: single/mapreduce {results['single']['seconds']:.2f}s / {results['mapreduce']['seconds']:.2f}s "
+          f"-> stream {stats['ttft']:.2f}s (마지막 호출 {stats['final_ttft']:.2f}s), {stats['tokens_per_second']:.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""/search 처리량 벤치마크 (가짜 네이버 서버 상대로 동기 핸들러 vs 비동기 핸들러)
+
+가짜 네이버 서버(bench.stub_naver)와 검색 서버를 각각 uvicorn 프로세스(워커 1개)로 띄우고,
+검색을 동시에 여러 개 보내면서 초당 처리 수, 검색 지연, 그 사이 /health 지연을 잰다.
+
+- sync:  bench.sync_app:app  (예전 방식, def 핸들러 + 요청마다 asyncio.run)
+- async: main:app            (async def 핸들러, 공유 AsyncClient)
+
+    cd BeautifulSoup
+    python -m bench.bench_search                         # 동시 검색 50, 10초
+    python -m bench.bench_search --concurrency 200 --duration 20 --modes async
+
+세 프로세스(가짜 서버, 검색 서버, 부하 생성기)가 같은 머신의 CPU를 나눠 쓰므로
+코어가 적으면 처리량은 CPU에 묶이고, 차이는 주로 검색 중 /health 지연에서 보인다.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+from common.stats import percentile
+
+ROOT = Path(__file__).resolve().parents[1]
+
+APPS = {
+    "sync": "bench.sync_app:app",
+    "async": "main:app",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(app: str, port: int, env: dict):
+    """uvicorn 프로세스 하나를 띄우고 /health가 응답할 때까지 기다린다"""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT,
+        env={**os.environ, **env},
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{app} 서버가 뜨지 않았습니다")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+async def load(base_url: str, concurrency: int, duration: float, display: int, mode: str):
+    search_latencies, health_latencies = [], []
+    errors = 0
+    counter = itertools.count()
+    stop = time.perf_counter() + duration
+
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def searcher():
+            nonlocal errors
+            while time.perf_counter() < stop:
+                # 검색어가 매번 달라서 기사 캐시에 걸리지 않는다 (매번 새 기사를 수집)
+                params = {"query": f"{mode}-{next(counter)}", "display": display}
+                start = time.perf_counter()
+                try:
+                    resp = await client.get("/search", params=params)
+                    resp.raise_for_status()
+                    if resp.json()["total"] != display:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                search_latencies.append(time.perf_counter() - start)
+
+        async def prober():
+            while time.perf_counter() < stop:
+                start = time.perf_counter()
+                try:
+                    await client.get("/health")
+                except httpx.HTTPError:
+                    pass
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        await asyncio.gather(prober(), *(searcher() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "searches": len(search_latencies),
+        "rps": len(search_latencies) / elapsed,
+        "errors": errors,
+        "search_p50": percentile(search_latencies, 50) if search_latencies else float("nan"),
+        "search_p99": percentile(search_latencies, 99) if search_latencies else float("nan"),
+        "health_p50": percentile(health_latencies, 50),
+        "health_p99": percentile(health_latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=list(APPS), choices=list(APPS))
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 검색 수")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--display", type=int, default=10, help="검색 한 번에 가져올 기사 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    stub_port = free_port()
+    stub_env = {"STUB_LATENCY": str(args.latency)}
+    print(f"동시 검색 {args.concurrency}, 검색당 기사 {args.display}개, 가짜 서버 지연 {args.latency * 1000:.0f}ms, {args.duration:.0f}초")
+    print(f"{'mode':<7}{'search/s':>10}{'p50 s':>9}{'p99 s':>9}{'health p50 ms':>15}{'health p99 ms':>15}{'errors':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp, serve("bench.stub_naver:app", stub_port, stub_env) as stub_url:
+        for mode in args.modes:
+            env = {
+                "NAVER_API_KEY": "stub",
+                "NAVER_SECRET_KEY": "stub",
+                "NAVER_API_URL": f"{stub_url}/v1/search/news.json",
+                "ARTICLE_STORE_PATH": str(Path(tmp) / f"{mode}.db"),
+                # 가짜 서버 한 곳에 모든 기사가 몰리므로 호스트당 제한은 전체 제한과 같게
+                "FETCH_PER_HOST": os.getenv("FETCH_PER_HOST", "20"),
+                "HTTP_POOL_SIZE": os.getenv("HTTP_POOL_SIZE", "50"),
+            }
+            with serve(APPS[mode], free_port(), env) as base_url:
+                r = asyncio.run(load(base_url, args.concurrency, args.duration, args.display, mode))
+            print(
+                f"{mode:<7}{r['rps']:>10.1f}{r['search_p50']:>9.2f}{r['search_p99']:>9.2f}"
+                f"{r['health_p50'] * 1000:>15.1f}{r['health_p99'] * 1000:>15.1f}{r['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""검색 결과 페이지 수집기(news_collector / main.collect_naver_news) 확인
+
+가짜 검색 API(중복 기사가 섞인 순위 목록)를 상대로
+- 결과가 순위대로, link / originallink 중복 없이, limit개까지만 나오는지 (중복을 뺀 만큼 뒤 페이지를 더 가져옴)
+- 페이지 요청이 API 한도(display 100, start 1000)와 응답의 total 안에서만 나가는지
+- /search의 display > 100이 여러 페이지 수집으로 처리되는지
+를 확인한다 (네트워크 없음).
+
+    cd BeautifulSoup
+    python -m bench.check_collect            # 다르면 종료 코드 1
+"""
+import asyncio
+
+import main
+from news_collector import MAX_DISPLAY, MAX_START, collect_news
+
+
+def fake_results(total: int) -> list[dict]:
+    """순위 1..total 기사 (7번째마다 앞 기사의 link, 11번째마다 앞 기사의 originallink를 다시 씀)"""
+    items = []
+    for rank in range(1, total + 1):
+        link = f"https://n.news.naver.com/mnews/article/001/{rank:010d}"
+        original = f"https://example.com/{rank}"
+        if rank % 7 == 0:
+            link = items[rank - 2]["link"]
+        if rank % 11 == 0:
+            original = items[rank - 3]["originallink"]
+        items.append({"title": f"기사 {rank}", "link": link, "originallink": original, "rank": rank})
+    return items
+
+
+class FakeSearchApi:
+    def __init__(self, total: int):
+        self.results = fake_results(total)
+        self.requests: list[tuple[int, int]] = []
+
+    async def fetch_page(self, start: int, display: int) -> dict:
+        self.requests.append((start, display))
+        await asyncio.sleep(0)
+        return {"total": len(self.results), "items": self.results[start - 1:start - 1 + display]}
+
+    def expected(self, limit: int) -> list[int]:
+        seen, ranks = set(), []
+        # 페이지는 start 1, 101, ..., 901까지라서 1000위까지만 닿는다
+        for item in self.results[:MAX_START]:
+            keys = {item["link"], item["originallink"]}
+            if keys & seen:
+                continue
+            seen |= keys
+            ranks.append(item["rank"])
+        return ranks[:limit]
+
+
+async def collect(api: FakeSearchApi, limit: int) -> list[int]:
+    return [item["rank"] async for item in collect_news(api.fetch_page, limit=limit, concurrency=4)]
+
+
+async def search_items_via_main(display: int) -> tuple[list[dict], list[tuple[int, int]]]:
+    api = FakeSearchApi(2000)
+    original = main.search_naver_news_async
+
+    async def fake_search(query, display=10, start=1, sort="sim"):
+        return await api.fetch_page(start, int(display))
+
+    main.search_naver_news_async = fake_search
+    try:
+        return await main.search_items("검색어", str(display)), api.requests
+    finally:
+        main.search_naver_news_async = original
+
+
+def checks():
+    for total, limit in ((2000, 1000), (2000, 250), (2000, 10), (230, 1000)):
+        api = FakeSearchApi(total)
+        got = asyncio.run(collect(api, limit))
+        yield f"total {total}, limit {limit}: 순위대로 중복 없이 {len(got)}개", got == api.expected(limit)
+        starts = sorted(start for start, _ in api.requests)
+        yield f"total {total}, limit {limit}: 페이지 {starts}", (
+            api.requests[0] == (1, MAX_DISPLAY)
+            and starts == list(range(1, len(starts) * MAX_DISPLAY, MAX_DISPLAY))
+            and starts[-1] <= min(total, MAX_START)
+            and all(display <= MAX_DISPLAY for _, display in api.requests)
+        )
+
+    items, requests = asyncio.run(search_items_via_main(250))
+    links = [item["link"] for item in items]
+    yield "/search display=250", len(items) == 250 and len(set(links)) == 250 and len(requests) >= 3
+
+
+def main_cli():
+    failures = 0
+    for name, ok in checks():
+        failures += not ok
+        print(f"{'OK' if ok else 'FAIL':<5} {name}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main_cli()
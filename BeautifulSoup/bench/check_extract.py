@@ -0,0 +1,62 @@
+"""본문 추출 엔진 golden 출력 비교
+
+bench/corpus/*.html 마다 bench/corpus/golden.json 에 저장된 기대 출력과
+모든 엔진(bs4, lxml)의 결과가 글자 하나까지 같은지 확인한다.
+
+    cd BeautifulSoup
+    python -m bench.check_extract            # 확인 (다르면 종료 코드 1)
+    python -m bench.check_extract --update   # bs4 엔진 출력으로 golden.json 다시 만들기
+"""
+import argparse
+import difflib
+import json
+from pathlib import Path
+
+from extractors import ENGINES, extract_bs4
+
+CORPUS = Path(__file__).parent / "corpus"
+GOLDEN = CORPUS / "golden.json"
+
+
+def load_corpus() -> dict[str, str]:
+    return {path.name: path.read_text(encoding="utf-8") for path in sorted(CORPUS.glob("*.html"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="bs4 출력으로 golden.json 갱신")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if args.update:
+        golden = {name: extract_bs4(html) for name, html in corpus.items()}
+        GOLDEN.write_text(json.dumps(golden, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"{len(golden)}개 페이지의 golden 출력을 저장했습니다: {GOLDEN}")
+        return
+
+    golden = json.loads(GOLDEN.read_text(encoding="utf-8"))
+    failures = 0
+    for name, html in corpus.items():
+        for engine, extract in ENGINES.items():
+            try:
+                got = extract(html)
+            except Exception as e:
+                failures += 1
+                print(f"FAIL  {engine:<5} {name}  {type(e).__name__}: {e}")
+                continue
+            if got == golden.get(name):
+                print(f"OK    {engine:<5} {name}")
+                continue
+            failures += 1
+            print(f"FAIL  {engine:<5} {name}")
+            diff = difflib.unified_diff(
+                (golden.get(name) or "").splitlines(), (got or "").splitlines(),
+                "golden", engine, lineterm="",
+            )
+            print("\n".join(diff))
+
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
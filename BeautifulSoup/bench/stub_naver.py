@@ -0,0 +1,60 @@
+"""벤치마크용 가짜 네이버 서버 (검색 API + 기사 페이지)
+
+    uvicorn bench.stub_naver:app --port 9000
+
+- GET /v1/search/news.json?query=..&display=..&start=..  검색 결과 (링크는 이 서버의 기사 페이지)
+- GET /n.news.naver.com/mnews/article/{oid}/{aid}        기사 HTML
+
+기사 링크 경로에 n.news.naver.com이 들어 있어서 main.py의 네이버 도메인 체크를 통과한다.
+STUB_LATENCY(초)만큼 기다렸다 응답해서 실제 네트워크 지연을 흉내 낸다.
+"""
+import asyncio
+import os
+import zlib
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+
+LATENCY = float(os.getenv("STUB_LATENCY", "0.05"))
+API_LATENCY = float(os.getenv("STUB_API_LATENCY", str(LATENCY)))
+TOTAL = int(os.getenv("STUB_TOTAL", "1000"))  # 검색어마다 전체 결과 수
+
+app = FastAPI(title="Stub Naver")
+
+ARTICLE_HTML = (
+    "<html><head><title>{title}</title></head><body>"
+    '<div id="dic_area">{body}<figure>사진 설명</figure>'
+    '<div class="copyright">무단 전재 금지</div></div>'
+    "</body></html>"
+)
+
+
+@app.get("/v1/search/news.json")
+async def search(request: Request, query: str, display: int = 10, start: int = 1):
+    await asyncio.sleep(API_LATENCY)
+    # 같은 검색어는 항상 같은 기사 목록 (aid = 검색어 해시 + 순위)
+    key = zlib.crc32(query.encode("utf-8"))
+    base = str(request.base_url).rstrip("/")
+    items = [
+        {
+            "title": f"<b>{query}</b> 관련 기사 {rank}",
+            "originallink": f"https://example.com/{key}/{rank}",
+            "link": f"{base}/n.news.naver.com/mnews/article/{key % 1000:03d}/{key:010d}{rank:04d}?sid=101",
+            "description": f"{query} 설명 {rank}",
+            "pubDate": "Thu, 23 Oct 2025 14:15:00 +0900",
+        }
+        for rank in range(start, min(start + display, TOTAL + 1))
+    ]
+    return {"total": TOTAL, "start": start, "display": len(items), "items": items}
+
+
+@app.get("/n.news.naver.com/mnews/article/{oid}/{aid}", response_class=HTMLResponse)
+async def article(oid: str, aid: str):
+    await asyncio.sleep(LATENCY)
+    body = " ".join(f"{oid}번 언론사 {aid}번 기사의 {i}번째 문장입니다." for i in range(30))
+    return ARTICLE_HTML.format(title=f"{oid}/{aid}", body=body)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
@@ -0,0 +1,106 @@
+"""벤치마크용 가짜 OpenAI 서버 (POST /v1/chat/completions)
+
+    uvicorn bench.stub_openai:app --port 9100
+    OpenAI(base_url="http://127.0.0.1:9100/v1", api_key="stub")
+
+응답 지연 = STUB_BASE_LATENCY + 입력 토큰 x STUB_PREFILL_PER_TOKEN + 출력 토큰 x STUB_DECODE_PER_TOKEN
+출력 토큰 수는 max_tokens(없으면 STUB_COMPLETION_TOKENS)와 입력 토큰 수의 STUB_COMPLETION_RATIO배 중 작은 값이다.
+토큰 수는 llm_pipeline.count_tokens로 세서 usage에 넣는다.
+
+stream=true면 SSE로 한 토큰(한 글자)씩 보낸다: 첫 토큰은 입력 처리(prefill) 지연 뒤,
+그다음부터는 토큰마다 STUB_DECODE_PER_TOKEN 간격. stream_options.include_usage면 마지막에 usage 청크.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from llm_pipeline import count_tokens
+
+BASE_LATENCY = float(os.getenv("STUB_BASE_LATENCY", "0.3"))
+PREFILL_PER_TOKEN = float(os.getenv("STUB_PREFILL_PER_TOKEN", "0.00005"))
+DECODE_PER_TOKEN = float(os.getenv("STUB_DECODE_PER_TOKEN", "0.01"))
+COMPLETION_TOKENS = int(os.getenv("STUB_COMPLETION_TOKENS", "300"))
+COMPLETION_RATIO = float(os.getenv("STUB_COMPLETION_RATIO", "0.2"))
+
+app = FastAPI(title="Stub OpenAI")
+
+
+def _completion_text(n_tokens: int) -> str:
+    # 한글 한 글자 = 한 토큰 정도로 세어지므로 글자 수로 출력 길이를 맞춘다
+    words = "분석 결과 요약 문장 입니다 ".split()
+    out = []
+    while sum(len(w) + 1 for w in out) < n_tokens:
+        out.append(words[len(out) % len(words)])
+    return " ".join(out)[:n_tokens]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "stub")
+    prompt = "".join(str(m.get("content", "")) for m in body.get("messages", []))
+    prompt_tokens = count_tokens(prompt) + 4 * len(body.get("messages", []))
+    completion_tokens = max(1, min(body.get("max_tokens") or COMPLETION_TOKENS, int(prompt_tokens * COMPLETION_RATIO)))
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+    if body.get("stream"):
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+        return StreamingResponse(
+            _stream(completion_id, model, prompt_tokens, completion_tokens, usage if include_usage else None),
+            media_type="text/event-stream",
+        )
+
+    await asyncio.sleep(BASE_LATENCY + prompt_tokens * PREFILL_PER_TOKEN + completion_tokens * DECODE_PER_TOKEN)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": _completion_text(completion_tokens)},
+            "finish_reason": "stop",
+        }],
+        "usage": usage,
+    }
+
+
+async def _stream(completion_id: str, model: str, prompt_tokens: int, completion_tokens: int, usage):
+    def event(choices, usage=None) -> bytes:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": choices,
+        }
+        if usage is not None:
+            chunk["usage"] = usage
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+
+    await asyncio.sleep(BASE_LATENCY + prompt_tokens * PREFILL_PER_TOKEN)
+    yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+    for i, piece in enumerate(_completion_text(completion_tokens)):
+        if i:
+            await asyncio.sleep(DECODE_PER_TOKEN)
+        yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+    yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+    if usage is not None:
+        yield event([], usage)
+    yield b"data: [DONE]\n\n"
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
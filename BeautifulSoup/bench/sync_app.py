@@ -0,0 +1,36 @@
+"""비교용: 예전처럼 동기 def 핸들러로 검색하는 앱 (FastAPI 스레드풀에서 실행)
+
+    uvicorn bench.sync_app:app --port 8001
+
+검색/기사 수집 로직은 main.py의 비동기 경로 그대로이고, 핸들러만 def + 요청마다 asyncio.run이다.
+"""
+import asyncio
+
+from fastapi import FastAPI
+
+import main
+
+app = FastAPI(title="Naver News Search API (sync handlers)")
+
+
+def search_news_sync(query, display):
+    """이벤트 루프 밖에서 main.search_news를 부르는 얇은 동기 래퍼"""
+
+    async def run():
+        try:
+            return await main.search_news(query, display)
+        finally:
+            # asyncio.run이 끝나면 루프가 닫히므로 이 루프의 AsyncClient도 같이 닫는다
+            await main.http.aclose()
+
+    return asyncio.run(run())
+
+
+@app.get("/health")
+def health_check():
+    return {"status": "healthy"}
+
+
+@app.get("/search", response_model=main.NewsResponse)
+def search_news(query, display):
+    return search_news_sync(query, display)
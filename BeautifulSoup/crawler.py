@@ -0,0 +1,315 @@
+"""네이버 기사 대량 수집기 (오프라인 백필용 CLI)
+
+URL 목록(파일 또는 표준입력, 한 줄에 하나)이나 검색어의 네이버 뉴스 검색 결과를 읽어서 기사 본문을 수집하고
+압축된 JSONL(.jsonl.gz) 또는 Parquet 샤드로 저장한다.
+
+    cd BeautifulSoup
+    python crawler.py urls.txt --out crawl/ --concurrency 50 --per-host 8
+    cat urls.txt | python crawler.py - --out crawl/ --format parquet   # pyarrow 필요
+    python crawler.py --query 반도체 --limit 1000 --out crawl/           # 검색 상위 1000개 (NAVER_API_KEY 필요)
+
+- 본문 추출은 main.py와 같은 article_text_from_page(extract_naver_article_html)를 쓴다
+- --query는 main.collect_naver_news로 검색 결과 페이지를 병렬로 받아 link 중복을 빼고 순위대로 넘긴다
+- 전체 동시 요청 수와 호스트별 동시 요청 수/요청 간격(--host-delay)을 제한한다
+- 샤드가 완성될 때마다 그 샤드에서 결과가 확정된 URL을 out/done.txt에 적는다. 중간에 죽어도 다시
+  실행하면 done.txt에 있는 URL은 건너뛰고, 완성되지 못한 샤드(.tmp)는 지우고 그 URL부터 다시 수집한다
+- 결과 확정 = 응답을 받아 파싱까지 했거나(본문이 없어도) 다시 해도 같을 4xx 응답 (408, 429 제외).
+  연결 오류/타임아웃, 408, 429, 5xx, 파싱 중 예외는 샤드에는 기록하지만 done.txt에는 넣지 않으므로
+  다음 실행에서 다시 시도한다 (한 페이지의 예외로 전체 수집이 멈추지 않는다)
+- 진행 중에 articles/s, MB/s, 평균 파싱 ms를 표준에러로 출력한다
+
+샤드 레코드: {"url", "final_url", "status", "text", "error", "bytes", "parse_ms", "fetched_at"}
+본문을 못 얻은 URL도 text=null로 기록된다. 일시적 실패 뒤 다시 수집한 URL은 여러 샤드에 레코드가 있으므로
+fetched_at이 가장 늦은 것을 쓴다.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional
+from urllib.parse import urlsplit
+
+import main
+from main import RETRYABLE_4XX, article_text_from_page, http, parse_pool
+
+FORMATS = ("jsonl", "parquet")
+
+
+def is_final(record: dict) -> bool:
+    """다시 수집해도 결과가 같을 레코드인지 (done.txt에 넣어도 되는지)"""
+    status = record["status"]
+    if status is None or status >= 500:
+        return False
+    if status < 400:
+        # 응답은 받았지만 파싱하다 예외가 난 경우
+        return record["error"] is None
+    return status not in RETRYABLE_4XX
+
+
+def _timed_parse(final_url: str, html: str):
+    start = time.perf_counter()
+    text = article_text_from_page(final_url, html)
+    return text, (time.perf_counter() - start) * 1000
+
+
+class ShardWriter:
+    """레코드를 shard_size개씩 샤드 파일로 쓰고, 완성된 샤드에서 결과가 확정된 URL을 done.txt에 남긴다"""
+
+    def __init__(self, out_dir: Path, fmt: str = "jsonl", shard_size: int = 10000):
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise SystemExit("--format parquet 에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self.done_path = out_dir / "done.txt"
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        # 이전 실행이 남긴 미완성 샤드는 버린다 (그 URL들은 done.txt에 없으므로 다시 수집된다)
+        for tmp in out_dir.glob("part-*.tmp"):
+            tmp.unlink()
+        existing = [int(p.name[5:10]) for p in out_dir.glob("part-*") if p.name[5:10].isdigit()]
+        self.next_index = max(existing, default=-1) + 1
+
+        self.shards = 0
+        self._count = 0
+        self._rows: list[dict] = []
+        self._urls: list[str] = []
+        self._file = None
+        self._tmp_path: Optional[Path] = None
+
+    def done_urls(self) -> set:
+        if not self.done_path.exists():
+            return set()
+        with open(self.done_path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    def _suffix(self) -> str:
+        return ".jsonl.gz" if self.fmt == "jsonl" else ".parquet"
+
+    def write(self, record: dict):
+        if self.fmt == "jsonl":
+            # JSONL은 바로바로 압축 파일에 쓴다 (메모리에 모으지 않음)
+            if self._file is None:
+                self._tmp_path = self.out_dir / f"part-{self.next_index:05d}.tmp"
+                self._file = gzip.open(self._tmp_path, "wt", encoding="utf-8", compresslevel=6)
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._rows.append(record)
+        self._count += 1
+        if is_final(record):
+            self._urls.append(record["url"])
+        if self._count >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """현재 샤드를 완성(이름 변경)하고 결과가 확정된 URL을 done.txt에 추가"""
+        if not self._count:
+            return
+        final_path = self.out_dir / f"part-{self.next_index:05d}{self._suffix()}"
+        if self.fmt == "jsonl":
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, final_path)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tmp_path = self.out_dir / f"part-{self.next_index:05d}.tmp"
+            pq.write_table(pa.Table.from_pylist(self._rows), tmp_path, compression="zstd")
+            os.replace(tmp_path, final_path)
+            self._rows = []
+
+        with open(self.done_path, "a", encoding="utf-8") as f:
+            f.write("".join(url + "\n" for url in self._urls))
+            f.flush()
+            os.fsync(f.fileno())
+        self._urls = []
+        self._count = 0
+        self.next_index += 1
+        self.shards += 1
+
+
+class Progress:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.done = 0
+        self.ok = 0
+        self.failed = 0
+        self.retry = 0
+        self.bytes = 0
+        self.parse_ms = 0.0
+        self.parsed = 0
+
+    def add(self, record: dict):
+        self.done += 1
+        if record["text"] is not None:
+            self.ok += 1
+        else:
+            self.failed += 1
+        if not is_final(record):
+            self.retry += 1
+        self.bytes += record["bytes"]
+        if record["parse_ms"] is not None:
+            self.parse_ms += record["parse_ms"]
+            self.parsed += 1
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        parse = self.parse_ms / self.parsed if self.parsed else 0.0
+        return (
+            f"{self.done}건 (본문 {self.ok}, 실패 {self.failed}, 다음에 재시도 {self.retry}) "
+            f"{self.done / elapsed:.1f} articles/s, {self.bytes / elapsed / 1e6:.2f} MB/s, "
+            f"파싱 평균 {parse:.2f} ms, {elapsed:.0f}초"
+        )
+
+
+class HostPoliteness:
+    """호스트별 동시 요청 수 + 요청 시작 간격 제한"""
+
+    def __init__(self, per_host: int, delay: float):
+        self.delay = delay
+        self._slots = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self._next_start: dict[str, float] = defaultdict(float)
+
+    async def wait(self, host: str) -> asyncio.Semaphore:
+        slot = self._slots[host]
+        await slot.acquire()
+        if self.delay > 0:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, self._next_start[host])
+            self._next_start[host] = start + self.delay
+            if start > now:
+                await asyncio.sleep(start - now)
+        return slot
+
+
+async def crawl_one(url: str, polite: HostPoliteness, timeout: float) -> dict:
+    record = {
+        "url": url, "final_url": None, "status": None, "text": None, "error": None,
+        "bytes": 0, "parse_ms": None, "fetched_at": time.time(),
+    }
+    slot = await polite.wait(urlsplit(url).hostname or "")
+    try:
+        resp = await http.aget(url, timeout=timeout, follow_redirects=True)
+        record["status"] = resp.status_code
+        record["final_url"] = str(resp.url)
+        record["bytes"] = len(resp.content)
+        resp.raise_for_status()
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    finally:
+        slot.release()
+
+    loop = asyncio.get_running_loop()
+    try:
+        record["text"], record["parse_ms"] = await loop.run_in_executor(
+            parse_pool, _timed_parse, record["final_url"], resp.text
+        )
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def read_urls(source: str) -> Iterable[str]:
+    f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+async def seed_urls(args) -> AsyncIterator[str]:
+    """--query면 검색 상위 --limit개 기사의 link, 아니면 source의 URL"""
+    if args.query:
+        async for item in main.collect_naver_news(args.query, limit=args.limit):
+            yield item["link"]
+    else:
+        for url in read_urls(args.source):
+            yield url
+
+
+async def crawl(args) -> Progress:
+    writer = ShardWriter(Path(args.out), args.format, args.shard_size)
+    skip = writer.done_urls()
+    if skip:
+        print(f"체크포인트: 이미 수집한 URL {len(skip)}개는 건너뜁니다", file=sys.stderr)
+
+    # 공유 HttpClient의 풀이 --concurrency보다 작으면 풀에서 줄을 서게 되므로 맞춰 준다
+    http.pool_size = max(http.pool_size, args.concurrency)
+    polite = HostPoliteness(args.per_host, args.host_delay)
+    progress = Progress()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 4)
+
+    async def producer():
+        # 입력이 커도 한꺼번에 읽지 않는다 (큐가 차면 기다림)
+        async for url in seed_urls(args):
+            if url in skip:
+                continue
+            skip.add(url)  # 입력 안 중복 제거
+            await queue.put(url)
+        for _ in range(args.concurrency):
+            await queue.put(None)
+
+    async def worker():
+        while (url := await queue.get()) is not None:
+            record = await crawl_one(url, polite, args.timeout)
+            writer.write(record)
+            progress.add(record)
+
+    async def reporter():
+        while True:
+            await asyncio.sleep(args.report_every)
+            print(progress.line(), file=sys.stderr)
+
+    report_task = asyncio.create_task(reporter())
+    try:
+        await asyncio.gather(producer(), *(worker() for _ in range(args.concurrency)))
+    finally:
+        report_task.cancel()
+        # 중단(Ctrl+C)돼도 여기까지 쓴 레코드는 샤드로 남긴다
+        writer.flush()
+        await http.aclose()
+    print(f"완료: {progress.line()}, 샤드 {writer.shards}개 -> {writer.out_dir}", file=sys.stderr)
+    return progress
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", nargs="?", help="URL 목록 파일 (- 이면 표준입력)")
+    parser.add_argument("--query", help="URL 목록 대신 이 검색어의 네이버 뉴스 검색 결과를 수집")
+    parser.add_argument("--limit", type=int, default=1000, help="--query로 가져올 검색 결과 수 (최대 1000)")
+    parser.add_argument("--out", default="crawl", help="샤드/체크포인트 디렉터리")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--shard-size", type=int, default=10000, help="샤드 하나의 레코드 수")
+    parser.add_argument("--concurrency", type=int, default=main.FETCH_CONCURRENCY, help="전체 동시 요청 수")
+    parser.add_argument("--per-host", type=int, default=main.FETCH_PER_HOST, help="호스트별 동시 요청 수")
+    parser.add_argument("--host-delay", type=float, default=0.0, help="같은 호스트 요청 시작 간격(초)")
+    parser.add_argument("--timeout", type=float, default=main.ARTICLE_TIMEOUT)
+    parser.add_argument("--report-every", type=float, default=5.0, help="진행 상황 출력 간격(초)")
+    args = parser.parse_args()
+    if (args.source is None) == (args.query is None):
+        parser.error("URL 목록 파일(source)과 --query 중 하나만 주세요")
+
+    try:
+        asyncio.run(crawl(args))
+    except KeyboardInterrupt:
+        print("중단됨: 완성된 샤드까지 done.txt에 기록했습니다. 다시 실행하면 이어서 수집합니다.", file=sys.stderr)
+        raise SystemExit(130)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,94 @@
+"""네이버 기사 본문 추출 엔진
+
+- bs4: BeautifulSoup(lxml) 트리 + CSS select (기존 구현, 기준 출력)
+- lxml: lxml.html 트리를 바로 순회 (BeautifulSoup 객체를 만들지 않아 훨씬 빠름)
+
+두 엔진은 같은 입력에 같은 문자열을 돌려줘야 한다 (bench/check_extract.py로 확인).
+"""
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+# 본문 후보 (모바일 mnews -> PC news 순서)
+ARTICLE_IDS = ("dic_area", "newsct_article")
+
+# 본문에서 제거할 요소
+REMOVE_SELECTOR = "script, style, .media_end_correction, .copyright, figure"
+
+
+def _has_class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+_REMOVE_XPATH = (
+    f".//script | .//style | .//figure"
+    f" | .//*[{_has_class('media_end_correction')}]"
+    f" | .//*[{_has_class('copyright')}]"
+)
+
+# bs4 get_text가 건너뛰는 요소 (하위 요소의 텍스트까지 모두 제외)
+_SKIP_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+_lxml_parser = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _texts(el, removed):
+    """el 아래 텍스트 조각을 문서 순서대로 (제거/제외 요소는 건너뛰고 그 뒤 tail은 남김)
+
+    drop_tree는 tail을 앞 텍스트에 이어 붙여 bs4와 줄 나눔이 달라지므로 트리를 직접 순회한다.
+    """
+    if el.text:
+        yield el.text
+    for child in el:
+        # 주석/처리 명령은 tag가 문자열이 아니다
+        if isinstance(child.tag, str) and child not in removed and child.tag not in _SKIP_TAGS:
+            yield from _texts(child, removed)
+        if child.tail:
+            yield child.tail
+
+
+def extract_bs4(html: str):
+    soup = BeautifulSoup(html, "lxml")
+    # 모바일(mnews)에서 본문
+    article = soup.select_one("#dic_area")
+    # PC(news)에서 본문
+    if not article:
+        article = soup.select_one("#newsct_article")
+    if not article:
+        return None
+    # 불필요 요소 제거
+    for s in article.select(REMOVE_SELECTOR):
+        s.decompose()
+    for br in article.find_all("br"):
+        br.replace_with("\n")
+    return article.get_text("\n", strip=True)
+
+
+def extract_lxml(html: str):
+    if not html or not html.strip():
+        return None
+    try:
+        # str을 utf-8 bytes로 넘기면 문서 안의 <?xml encoding=...?> 선언과 충돌하지 않는다
+        doc = lxml_html.document_fromstring(html.encode("utf-8"), parser=_lxml_parser)
+    except etree.ParserError:
+        # 주석/선언만 있는 페이지 등 요소가 하나도 없는 문서 (bs4는 빈 트리가 되어 None)
+        return None
+
+    article = None
+    for article_id in ARTICLE_IDS:
+        found = doc.xpath(f'//*[@id="{article_id}"]')
+        if found:
+            article = found[0]
+            break
+    if article is None:
+        return None
+
+    removed = set(article.xpath(_REMOVE_XPATH))
+    # bs4 get_text("\n", strip=True)와 같은 규칙: 텍스트 조각마다 strip, 빈 조각은 버림
+    # <br>은 bs4 쪽에서도 "\n"으로 바뀐 뒤 strip되어 사라지므로 따로 처리할 필요가 없다
+    return "\n".join(piece for piece in (t.strip() for t in _texts(article, removed)) if piece)
+
+ENGINES = {
+    "bs4": extract_bs4,
+    "lxml": extract_lxml,
+}
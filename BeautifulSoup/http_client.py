@@ -0,0 +1,277 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+import weakref
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 재시도할 상태 코드 (요청 제한 + 일시적인 서버 오류)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 모아 둘 수 있는 토큰 버킷 (API 호출 속도 제한)
+
+    토큰이 모자라면 음수로 예약해 두고 차례가 올 때까지 잠든다. asyncio.Lock을 쓰지 않아서
+    여러 이벤트 루프/스레드에서 같은 버킷을 같이 써도 된다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0  # 토큰을 기다린 총 시간(초)
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+            return wait
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HttpClient:
+    """네이버 Open API / 기사 페이지 요청이 같이 쓰는 HTTP 클라이언트
+
+    - 동기: requests.Session + HTTPAdapter (호스트별 커넥션 풀, urllib3 Retry)
+    - 비동기: 이벤트 루프마다 httpx.AsyncClient 하나 (keep-alive, h2가 있으면 HTTP/2)
+    - 두 쪽 모두 429/5xx와 연결 오류를 지수 백오프 + 지터로 재시도한다
+    - stats()로 동시 요청 수, 재시도 수, 열린/유휴 커넥션 수를 본다 (/metrics gauge)
+    """
+
+    def __init__(
+        self,
+        headers: Optional[dict] = None,
+        pool_size: int = 20,
+        keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.3,
+        backoff_max: float = 10.0,
+        http2: bool = True,
+    ):
+        self.headers = dict(headers or {})
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=backoff,
+                backoff_max=backoff_max,
+                backoff_jitter=backoff,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=frozenset({"GET", "HEAD"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapter = adapter
+
+        # AsyncClient는 만든 이벤트 루프에서만 쓸 수 있어서 루프마다 하나씩 둔다
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # httpcore 풀은 대기 요청이 많으면 요청마다 대기열 전체를 훑는다 (O(대기 수 x 커넥션 수)).
+        # 풀 크기만큼만 풀에 들여보내고 나머지는 세마포어에서 기다리게 한다.
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    # ---- 공통 카운터 ----
+
+    def _start(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            if self.in_flight > self.peak_in_flight:
+                self.peak_in_flight = self.in_flight
+
+    def _finish(self, retried: int, failed: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self.retried += retried
+            if failed:
+                self.errors += 1
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """attempt번째 재시도 전 대기 시간 (full jitter, Retry-After가 있으면 그 이상)"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    # ---- 동기 ----
+
+    def get(self, url: str, timeout: float = 15, **kwargs) -> requests.Response:
+        """Session.get (재시도는 HTTPAdapter의 Retry가 처리)"""
+        self._start()
+        retried, failed = 0, True
+        try:
+            resp = self.session.get(url, timeout=timeout, **kwargs)
+            retries = getattr(resp.raw, "retries", None)
+            retried = len(retries.history) if retries is not None else 0
+            failed = resp.status_code >= 500
+            return resp
+        finally:
+            self._finish(retried, failed)
+
+    # ---- 비동기 ----
+
+    def async_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프의 공유 AsyncClient"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers=self.headers,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.keepalive,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._async_clients[loop] = client
+            self._async_slots[loop] = asyncio.Semaphore(self.pool_size)
+        return client
+
+    async def aget(self, url: str, timeout: float = 15, **kwargs) -> httpx.Response:
+        """AsyncClient.get + 429/5xx/연결 오류 재시도"""
+        client = self.async_client()
+        slots = self._async_slots[asyncio.get_running_loop()]
+        self._start()
+        attempt, failed = 0, True
+        try:
+            while True:
+                try:
+                    async with slots:
+                        resp = await client.get(url, timeout=timeout, **kwargs)
+                except httpx.TransportError:
+                    if attempt >= self.retries:
+                        raise
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                if resp.status_code in RETRY_STATUSES and attempt < self.retries:
+                    await resp.aclose()
+                    await asyncio.sleep(self._backoff_delay(attempt, _retry_after(resp.headers.get("Retry-After"))))
+                    attempt += 1
+                    continue
+                failed = resp.status_code >= 500
+                return resp
+        finally:
+            self._finish(attempt, failed)
+
+    # ---- 상태 ----
+
+    def _sync_pool_stats(self) -> tuple[int, int]:
+        """requests 쪽 (지금까지 새로 연 커넥션 수, 유휴 커넥션 수)
+
+        새로 연 커넥션 수가 요청 수보다 훨씬 작으면 keep-alive 재사용이 잘 되고 있는 것
+        """
+        opened = idle = 0
+        pools = self._adapter.poolmanager.pools
+        # RecentlyUsedContainer는 순회를 막아 두었지만 keys()는 락을 잡고 복사본을 준다
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections  # 누적값 (닫혀도 줄지 않음)
+            # 큐에는 반납된 커넥션과 아직 만들지 않은 자리(None)가 같이 들어 있다
+            idle += sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+        return opened, idle
+
+    def _async_pool_stats(self) -> tuple[int, int]:
+        """httpx 쪽 (열린 커넥션 수, 유휴 커넥션 수)"""
+        opened = idle = 0
+        for client in list(self._async_clients.values()):
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            for conn in getattr(pool, "connections", ()):
+                opened += 1
+                idle += conn.is_idle()
+        return opened, idle
+
+    def stats(self) -> dict:
+        sync_open, sync_idle = self._sync_pool_stats()
+        async_open, async_idle = self._async_pool_stats()
+        return {
+            "pool_size": self.pool_size,
+            "requests": self.requests,
+            "retries": self.retried,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "sync_connections_opened": sync_open,
+            "sync_idle_connections": sync_idle,
+            "async_connections": async_open,
+            "async_idle_connections": async_idle,
+        }
+
+    async def aclose(self):
+        """현재 루프의 AsyncClient 닫기"""
+        loop = asyncio.get_running_loop()
+        self._async_slots.pop(loop, None)
+        client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        self.session.close()
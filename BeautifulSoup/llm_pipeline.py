@@ -0,0 +1,335 @@
+"""뉴스 분석용 LLM 파이프라인 (토큰 수 기준 청크 분할 + map-reduce)
+
+    result = analyze_news(client, news_list, prompt)
+    result.text, result.stats   # stats: chunks, calls, prompt/completion 토큰, 단계별 시간
+
+- 기사마다 제목/링크/본문만 남기고, 본문은 article_tokens 토큰까지만 쓴다
+- 기사들을 공백 없는 JSON으로 직렬화해서 chunk_tokens 이하 묶음으로 나눈다
+- 묶음이 하나면 호출 한 번으로 끝낸다 (기존과 같음)
+- 여러 개면 묶음별 분석을 동시에 요청(map)하고, 부분 분석들을 합치는 호출(reduce)을 한다
+  (부분 분석이 한 번에 안 들어가면 reduce를 여러 단계로 반복)
+
+토큰 수는 tiktoken이 있으면 그걸로 세고, 없으면(또는 인코딩 파일을 못 받으면) 보수적으로 어림한다.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# 한 번 호출에 넣을 기사 묶음 토큰 수 / 기사 하나 본문 토큰 수 상한
+CHUNK_TOKENS = 6000
+ARTICLE_TOKENS = 1500
+
+# 메시지 하나당 붙는 형식 토큰 (role, 구분자)
+_MESSAGE_OVERHEAD = 4
+
+MAP_INSTRUCTION = (
+    "\n\n(아래 기사들은 전체 검색 결과 중 {index}/{total}번째 묶음입니다. "
+    "이 묶음의 기사들에 대해서만 위 요청대로 분석하세요. 나중에 다른 묶음의 분석과 합쳐집니다.)"
+)
+REDUCE_INSTRUCTION = (
+    "\n\n(아래는 같은 요청으로 기사 묶음별로 따로 만든 부분 분석들입니다. "
+    "중복을 합치고 서로 다른 내용은 모두 살려서, 전체 기사에 대한 하나의 분석으로 정리하세요.)"
+)
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # tiktoken이 없거나 인코딩 파일을 받을 수 없는 환경
+        return None
+
+
+def _estimate_tokens(text: str) -> int:
+    """tiktoken 없이 어림: ASCII는 약 4글자에 1토큰, 한글 등은 글자당 1토큰 (실제보다 약간 많게)"""
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return _estimate_tokens(text)
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    encoding = _encoding(model)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens]) + "…"
+    # 어림 계산일 때는 이분 탐색으로 자를 위치를 찾는다
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + "…"
+
+
+def compact_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_article(news: dict, article_tokens: int = ARTICLE_TOKENS, model: str = DEFAULT_MODEL) -> dict:
+    """분석에 필요한 필드만 남기고 본문 길이를 제한"""
+    return {
+        "title": news.get("title", ""),
+        "link": news.get("link", ""),
+        "text": truncate_tokens(news.get("text") or "", article_tokens, model),
+    }
+
+
+def pack_chunks(items: list, chunk_tokens: int, model: str = DEFAULT_MODEL) -> list[list]:
+    """순서를 유지하면서 JSON 배열 토큰 수가 chunk_tokens 이하가 되도록 묶는다
+
+    항목 하나가 chunk_tokens보다 크면 그 항목만으로 된 묶음을 만든다.
+    """
+    chunks: list[list] = []
+    current: list = []
+    current_tokens = 2  # "[]"
+    for item in items:
+        tokens = count_tokens(compact_json(item), model) + 1  # 구분자 ","
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 2
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class AnalysisResult(NamedTuple):
+    text: Optional[str]
+    stats: dict
+
+
+class _Usage:
+    """호출 수와 토큰 사용량 합계 (map 단계에서 여러 스레드가 같이 더한다)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, response):
+        usage = getattr(response, "usage", None)
+        with self._lock:
+            self.calls += 1
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_tokens or 0
+                self.completion_tokens += usage.completion_tokens or 0
+
+
+def _complete(client, model: str, system: str, user: str, usage: _Usage, **kwargs) -> str:
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        **kwargs,
+    )
+    usage.add(response)
+    return response.choices[0].message.content or ""
+
+
+def _prepare_final(
+    client, news_list, prompt, model, chunk_tokens, article_tokens, max_workers, usage, stats, **kwargs
+) -> tuple[str, str]:
+    """map과 마지막 한 번을 뺀 reduce까지 실행하고, 마지막 호출의 (system, user) 메시지를 반환"""
+    started = time.perf_counter()
+    articles = [compact_article(news, article_tokens, model) for news in news_list]
+    # 묶음 예산에서 시스템 프롬프트와 메시지 형식 토큰을 뺀다
+    budget = max(256, chunk_tokens - count_tokens(prompt + MAP_INSTRUCTION, model) - 2 * _MESSAGE_OVERHEAD)
+    chunks = pack_chunks(articles, budget, model)
+    stats.update(articles=len(articles), chunks=len(chunks), reduce_rounds=0, map_seconds=0.0, reduce_seconds=0.0)
+
+    if len(chunks) <= 1:
+        return prompt, compact_json(chunks[0] if chunks else [])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        partials = list(pool.map(
+            lambda args: _complete(
+                client, model,
+                prompt + MAP_INSTRUCTION.format(index=args[0], total=len(chunks)),
+                compact_json(args[1]), usage, **kwargs,
+            ),
+            enumerate(chunks, 1),
+        ))
+        stats["map_seconds"] = time.perf_counter() - started
+
+        reduce_started = time.perf_counter()
+        reduce_system = prompt + REDUCE_INSTRUCTION
+        reduce_budget = max(256, chunk_tokens - count_tokens(reduce_system, model) - 2 * _MESSAGE_OVERHEAD)
+        # 부분 분석이 한 번에 안 들어가면 들어갈 때까지 묶어서 여러 번 합친다
+        while True:
+            stats["reduce_rounds"] += 1
+            groups = pack_chunks(partials, reduce_budget, model)
+            if len(groups) == 1:
+                stats["reduce_seconds"] = time.perf_counter() - reduce_started
+                return reduce_system, compact_json(groups[0])
+            if len(groups) == len(partials):
+                # 부분 분석 하나하나가 예산만큼 커서 더 묶을 수 없으면 둘씩 합친다
+                groups = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+            partials = list(pool.map(
+                lambda group: _complete(client, model, reduce_system, compact_json(group), usage, **kwargs),
+                groups,
+            ))
+
+
+def _finish_stats(stats: dict, usage: _Usage, started: float, final_started: float):
+    final_seconds = time.perf_counter() - final_started
+    # 마지막 호출은 묶음이 하나면 map, 여러 개면 reduce에 포함
+    stats["reduce_seconds" if stats["chunks"] > 1 else "map_seconds"] += final_seconds
+    stats.update(
+        calls=usage.calls,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def analyze_news(
+    client,
+    news_list: list[dict],
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    chunk_tokens: int = CHUNK_TOKENS,
+    article_tokens: int = ARTICLE_TOKENS,
+    max_workers: int = 8,
+    **kwargs,
+) -> AnalysisResult:
+    """news_list를 prompt대로 분석 (필요하면 map-reduce), kwargs는 chat.completions.create로 전달"""
+    usage = _Usage()
+    stats: dict = {}
+    started = time.perf_counter()
+    system, user = _prepare_final(
+        client, news_list, prompt, model, chunk_tokens, article_tokens, max_workers, usage, stats, **kwargs
+    )
+    final_started = time.perf_counter()
+    text = _complete(client, model, system, user, usage, **kwargs)
+    _finish_stats(stats, usage, started, final_started)
+    return AnalysisResult(text, stats)
+
+
+class AnalysisStream:
+    """analyze_news의 스트리밍 버전: map/중간 reduce는 그대로 하고 마지막 호출만 stream=True
+
+        analysis = AnalysisStream(client, news_list, prompt)
+        st.write_stream(analysis)      # 텍스트 조각을 받는 대로 출력
+        analysis.stats                 # ttft, tokens_per_second 등 (끝난 뒤)
+
+    이터레이터를 끝까지 읽지 않고 닫거나(close) 중간에 예외가 나면 OpenAI 스트림 연결을 끊어서
+    생성을 멈춘다 (Streamlit 재실행으로 스크립트가 중단될 때).
+
+    stats 추가 항목:
+    - ttft: 분석 시작부터 첫 토큰까지 (map 포함, 사용자가 기다린 시간)
+    - final_ttft: 마지막 요청을 보낸 뒤 첫 토큰까지
+    - tokens_per_second: 마지막 호출의 첫 토큰 이후 출력 토큰 속도
+    - cancelled: 끝까지 받기 전에 닫혔는지
+    """
+
+    def __init__(
+        self,
+        client,
+        news_list: list[dict],
+        prompt: str,
+        model: str = DEFAULT_MODEL,
+        chunk_tokens: int = CHUNK_TOKENS,
+        article_tokens: int = ARTICLE_TOKENS,
+        max_workers: int = 8,
+        **kwargs,
+    ):
+        self.client = client
+        self.news_list = news_list
+        self.prompt = prompt
+        self.model = model
+        self.chunk_tokens = chunk_tokens
+        self.article_tokens = article_tokens
+        self.max_workers = max_workers
+        self.kwargs = kwargs
+        self.stats: dict = {}
+        self.text = ""
+        self._stream = None
+        self._iterator = None
+
+    def __iter__(self):
+        if self._iterator is None:
+            self._iterator = self._generate()
+        return self._iterator
+
+    def _generate(self):
+        usage = _Usage()
+        started = time.perf_counter()
+        system, user = _prepare_final(
+            self.client, self.news_list, self.prompt, self.model, self.chunk_tokens,
+            self.article_tokens, self.max_workers, usage, self.stats, **self.kwargs,
+        )
+        final_started = time.perf_counter()
+        first_token = None
+        final_usage = None
+        pieces = []
+        self.stats["cancelled"] = True
+        self._stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            stream=True,
+            stream_options={"include_usage": True},
+            **self.kwargs,
+        )
+        try:
+            for chunk in self._stream:
+                if getattr(chunk, "usage", None) is not None:
+                    final_usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                piece = chunk.choices[0].delta.content
+                if not piece:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter()
+                pieces.append(piece)
+                yield piece
+            self.stats["cancelled"] = False
+        finally:
+            self._stream.close()
+            self.text = "".join(pieces)
+            ended = time.perf_counter()
+            completion_tokens = (
+                final_usage.completion_tokens if final_usage is not None else count_tokens(self.text, self.model)
+            )
+            usage.calls += 1
+            usage.prompt_tokens += final_usage.prompt_tokens if final_usage is not None else 0
+            usage.completion_tokens += completion_tokens
+            _finish_stats(self.stats, usage, started, final_started)
+            self.stats["ttft"] = (first_token - started) if first_token else None
+            self.stats["final_ttft"] = (first_token - final_started) if first_token else None
+            generation = ended - first_token if first_token else 0.0
+            self.stats["tokens_per_second"] = completion_tokens / generation if generation > 0 else None
+
+    def close(self):
+        """스트림을 끝까지 읽지 않고 멈춤"""
+        if self._iterator is not None:
+            self._iterator.close()
+        elif self._stream is not None:
+            self._stream.close()
@@ -1,22 +1,54 @@
+import asyncio
+import json
 import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query
+from urllib.parse import urlsplit
+import httpx
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+# 저장소 루트의 common 패키지 (FastAPI/app과 같이 쓰는 메트릭)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.metrics import CONTENT_TYPE, Metrics, MetricsMiddleware
+from article_cache import MISS, ArticleCache
+from article_store import ArticleStore, StoredArticle
+from extractors import ENGINES
+from http_client import HttpClient, TokenBucket
+from news_collector import MAX_DISPLAY, collect_news
+from search_cache import SearchCache, search_key
+
 # 환경변수 로드
 load_dotenv()
 
-app = FastAPI(title="Naver News Search API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 서버 이벤트 루프에서 만든 AsyncClient 정리
+    await http.aclose()
+    close_article_store()
+
+
+app = FastAPI(title="Naver News Search API", lifespan=lifespan)
+
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 
 # 응답 모델
 class NewsArticle(BaseModel):
     title: str
     link: str
-    body: str
+    text: str
 
 
 class NewsResponse(BaseModel):
@@ -31,40 +63,103 @@ UA = (
     "Chrome/123.0 Safari/537.36"
 )
 
-session = requests.Session()
-session.headers.update({"User-Agent": UA, "Accept-Language": "ko-KR,ko;q=0.9"})
+HEADERS = {"User-Agent": UA, "Accept-Language": "ko-KR,ko;q=0.9"}
+
+# 네이버 Open API와 기사 페이지가 같이 쓰는 HTTP 클라이언트 (커넥션 풀, keep-alive, 재시도)
+http = HttpClient(
+    headers=HEADERS,
+    pool_size=int(os.getenv("HTTP_POOL_SIZE", "20")),
+    keepalive=int(os.getenv("HTTP_KEEPALIVE", "20")),
+    keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+    retries=int(os.getenv("HTTP_RETRIES", "3")),
+    backoff=float(os.getenv("HTTP_BACKOFF", "0.3")),
+    http2=os.getenv("HTTP2", "1") != "0",
+)
+
+NAVER_API_URL = os.getenv("NAVER_API_URL", "https://openapi.naver.com/v1/search/news.json")
+
+# 네이버 검색 API 호출 속도 제한 (초당 호출 수, 0이면 제한 없음)
+naver_rate = TokenBucket(rate=float(os.getenv("NAVER_API_RATE", "10")))
+
+# 요청별 타임아웃(초)
+NAVER_API_TIMEOUT = float(os.getenv("NAVER_API_TIMEOUT", "20"))
+ARTICLE_TIMEOUT = float(os.getenv("ARTICLE_TIMEOUT", "15"))
+
+# 기사 병렬 수집 설정
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "20"))  # 전체 동시 요청 수
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "8"))  # 호스트 하나당 동시 요청 수
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "20"))  # 검색 한 번의 전체 수집 제한 시간(초)
+
+# 프로세스 전체에서 공유하는 기사 본문 캐시 (최종 URL 기준, TTL 초)
+article_cache = ArticleCache(
+    max_entries=int(os.getenv("ARTICLE_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("ARTICLE_CACHE_TTL", "600")),
+)
+
+# 검색어 단위 결과 캐시 (같은 검색이 동시에 오면 한 번만 계산)
+search_cache = SearchCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_SIZE", "1000")),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "60")),
+)
+# 일시적 오류나 시간 초과로 빠진 기사가 있는 검색 결과의 TTL (잠깐의 장애를 SEARCH_CACHE_TTL 내내 돌려주지 않도록)
+SEARCH_CACHE_PARTIAL_TTL = float(os.getenv("SEARCH_CACHE_PARTIAL_TTL", "5"))
+
+# 4xx지만 잠시 뒤 다시 하면 될 수 있는 응답 (Request Timeout, Too Many Requests)
+RETRYABLE_4XX = (408, 429)
+
+# 본문 추출 엔진: bs4(기존) 또는 lxml(빠름, 같은 결과)
+extract_engine = ENGINES[os.getenv("EXTRACT_ENGINE", "lxml")]
+
+# 재시작해도 남는 기사 저장소 (조건부 GET으로 재검증)
+# 처음 쓸 때 연다: main은 parse_pool 자식 프로세스, crawler.py, bench에서도 import되므로 import만으로 DB 파일을 만들지 않는다
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", "articles.db")
+_article_store: Optional[ArticleStore] = None
+_article_store_lock = threading.Lock()
+
+
+def get_article_store() -> ArticleStore:
+    global _article_store
+    if _article_store is None:
+        with _article_store_lock:
+            if _article_store is None:
+                _article_store = ArticleStore(ARTICLE_STORE_PATH)
+    return _article_store
+
+
+def close_article_store():
+    global _article_store
+    with _article_store_lock:
+        if _article_store is not None:
+            _article_store.close()
+            _article_store = None
+
+
+# 본문 파싱은 CPU 작업이라 이벤트 루프 밖에서 실행 (PARSE_POOL=process 면 프로세스풀)
+if os.getenv("PARSE_POOL") == "process":
+    parse_pool = ProcessPoolExecutor()
+else:
+    parse_pool = ThreadPoolExecutor(thread_name_prefix="article-parse")
 
 
 def extract_naver_article_html(html: str):
-    """네이버 뉴스 페이지 전용 파서"""
-    soup = BeautifulSoup(html, "lxml")
-    # 모바일(mnews)에서 본문
-    article = soup.select_one("#dic_area")
-    # PC(news)에서 본문
-    if not article:
-        article = soup.select_one("#newsct_article")
-    if not article:
-        return None
-    # 불필요 요소 제거
-    for s in article.select(
-        "script, style, .media_end_correction, .copyright, figure"
-    ):
-        s.decompose()
-    for br in article.find_all("br"):
-        br.replace_with("\n")
-    return article.get_text("\n", strip=True)
+    """네이버 뉴스 페이지 전용 파서 (EXTRACT_ENGINE 환경변수로 엔진 선택)"""
+    return extract_engine(html)
 
 
-def fetch_article_text(url: str, timeout: int = 15):
-    try:
-        resp = session.get(url, timeout=timeout, allow_redirects=True)
-        resp.raise_for_status()
-    except Exception:
-        return None
+def revalidated(url: str, stored: StoredArticle):
+    """304 응답: 저장된 본문을 그대로 쓰고 확인 시각만 갱신"""
+    get_article_store().touch(url)
+    article_cache.put(url, stored.final_url, stored.text)
+    return stored.text
+
+
+def remember_article(url: str, final_url: str, text: Optional[str], headers):
+    article_cache.put(url, final_url, text)
+    get_article_store().put(url, final_url, text, headers.get("ETag"), headers.get("Last-Modified"))
 
-    html = resp.text
-    final_url = resp.url
 
+def article_text_from_page(final_url: str, html: str):
+    """최종 URL과 HTML에서 본문 추출 (네이버 뉴스가 아니거나 본문이 짧으면 None)"""
     # 네이버 뉴스 도메인 체크
     if (
         "n.news.naver.com" not in final_url
@@ -80,8 +175,111 @@ def fetch_article_text(url: str, timeout: int = 15):
     return None
 
 
-def search_naver_news(query: str, display: int = 10):
-    """네이버 뉴스 검색 API 호출"""
+async def fetch_article_text_async(url: str, host_limit: asyncio.Semaphore, timeout: float = ARTICLE_TIMEOUT):
+    """기사 본문 가져오기 (메모리 캐시 -> 저장소 조건부 GET -> 파싱), 파싱은 parse_pool에서 실행
+
+    본문이 없으면 None. 네트워크 오류, 5xx, 408/429처럼 다시 하면 될 수 있는 실패는 예외로 올린다.
+    """
+    cached = article_cache.get(url)
+    if cached is not MISS:
+        return cached
+
+    # SQLite 조회는 블로킹이라 이벤트 루프 밖에서
+    stored = await asyncio.to_thread(get_article_store().get, url)
+    async with host_limit:
+        try:
+            resp = await http.aget(
+                url,
+                timeout=timeout,
+                follow_redirects=True,
+                headers=stored.conditional_headers() if stored else None,
+            )
+            # 304는 성공 응답이 아니므로 raise_for_status 전에 걸러낸다
+            if resp.status_code != 304:
+                resp.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            # 없는 기사 등 다시 해도 같을 4xx는 본문 없음. 나머지는 일시적일 수 있으므로 캐시하지 않고 올린다
+            status = e.response.status_code
+            if status < 500 and status not in RETRYABLE_4XX:
+                return None
+            raise
+
+    if resp.status_code == 304 and stored:
+        return await asyncio.to_thread(revalidated, url, stored)
+
+    loop = asyncio.get_running_loop()
+    final_url = str(resp.url)
+    text = await loop.run_in_executor(parse_pool, article_text_from_page, final_url, resp.text)
+    await asyncio.to_thread(remember_article, url, final_url, text, resp.headers)
+    return text
+
+
+async def iter_articles(
+    urls: List[str],
+    concurrency: int = FETCH_CONCURRENCY,
+    per_host: int = FETCH_PER_HOST,
+    deadline: float = FETCH_DEADLINE,
+    failed: Optional[set] = None,
+):
+    """여러 기사를 동시에 가져와서 끝나는 순서대로 (url, 본문)을 내보내는 async generator
+
+    deadline 안에 끝나지 않은 기사는 취소하고 내보내지 않는다 (부분 결과 허용).
+    일시적으로 실패한 기사는 본문 None으로 내보내고, failed를 넘기면 그 URL을 넣어 준다.
+    같은 URL이 여러 번 나와도 한 번만 가져온다. 소비하는 쪽이 중간에 멈추면 남은 요청은 취소된다.
+    """
+    limit = asyncio.Semaphore(concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(per_host))
+
+    async def fetch(url: str):
+        async with limit:
+            try:
+                return url, await fetch_article_text_async(url, host_limits[urlsplit(url).hostname])
+            except Exception:
+                if failed is not None:
+                    failed.add(url)
+                return url, None
+
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    pending = {asyncio.create_task(fetch(url)) for url in dict.fromkeys(urls)}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, end - loop.time()), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def fetch_articles(urls: List[str], **kwargs) -> dict:
+    """iter_articles를 다 모아서 url -> 본문 dict로 반환 (시간 안에 못 가져온 기사는 빠진다)"""
+    return {url: text async for url, text in iter_articles(urls, **kwargs)}
+
+
+def search_result(items: List[dict], texts: dict, failed: set) -> dict:
+    """검색 결과 + 가져온 본문 -> 캐시에 넣을 응답 (일시적 실패/시간 초과로 빠진 기사가 있으면 partial)
+
+    requested(검색 결과 수)도 같이 넣어 두어 /search/stream이 캐시 적중 때도 같은 값을 보고한다.
+    """
+    links = [item['link'] for item in items]
+    result = build_news_response(items, [texts.get(link) for link in links])
+    result["requested"] = len(items)
+    result["partial"] = bool(failed) or any(link not in texts for link in links)
+    return result
+
+
+def search_result_ttl(result: dict) -> float:
+    return SEARCH_CACHE_PARTIAL_TTL if result.get("partial") else search_cache.ttl
+
+
+def naver_search_request(query: str, display: int = 10, start: int = 1, sort: str = "sim"):
+    """네이버 뉴스 검색 API 요청 (params, headers)"""
     api_key = os.getenv("NAVER_API_KEY")
     secret_key = os.getenv("NAVER_SECRET_KEY")
 
@@ -91,23 +289,26 @@ def search_naver_news(query: str, display: int = 10):
             detail="NAVER_API_KEY or NAVER_SECRET_KEY not found in environment variables",
         )
 
-    url = "https://openapi.naver.com/v1/search/news.json"
-
     params = {
         "query": query,
         "display": display,
-        "start": 1,
-        "sort": "sim",
+        "start": start,
+        "sort": sort,
     }
 
     headers = {
         "X-Naver-Client-Id": api_key,
         "X-Naver-Client-Secret": secret_key,
     }
+    return params, headers
 
+
+async def search_naver_news_async(query: str, display: int = 10, start: int = 1, sort: str = "sim"):
+    """네이버 뉴스 검색 API 호출 (naver_rate 토큰 버킷을 거친다)"""
+    params, headers = naver_search_request(query, display, start, sort)
+    await naver_rate.acquire()
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=20)
-        resp.encoding = "utf-8"
+        resp = await http.aget(NAVER_API_URL, params=params, headers=headers, timeout=NAVER_API_TIMEOUT)
         resp.raise_for_status()
         return resp.json()
     except Exception as e:
@@ -116,6 +317,19 @@ def search_naver_news(query: str, display: int = 10):
         )
 
 
+def collect_naver_news(query: str, limit: int = 1000, sort: str = "sim", concurrency: int = 4):
+    """검색 결과 상위 limit개(최대 1000)를 페이지 병렬 요청으로 모아 순위대로 내보내는 async generator
+
+        async for item in collect_naver_news("반도체", limit=1000):
+            ...
+    """
+
+    def fetch_page(start: int, display: int):
+        return search_naver_news_async(query, display, start, sort)
+
+    return collect_news(fetch_page, limit=limit, concurrency=concurrency)
+
+
 @app.get("/")
 def read_root():
     return {"message": "Naver News Search API"}
@@ -126,35 +340,128 @@ def health_check():
     return {"status": "healthy"}
 
 
+metrics.add_gauge("article_cache_entries", "Articles in the in-process cache.", lambda: len(article_cache))
+metrics.add_gauge("article_cache_hits", "Article cache hits since start.", lambda: article_cache.hits)
+metrics.add_gauge("article_cache_misses", "Article cache misses since start.", lambda: article_cache.misses)
+metrics.add_gauge("article_store_entries", "Articles in the on-disk store.", lambda: len(_article_store) if _article_store is not None else 0)
+for _stat in ("hits", "misses", "coalesced", "entries", "inflight"):
+    metrics.add_gauge(f"search_cache_{_stat}", f"Search cache {_stat}.", lambda s=_stat: search_cache.stats()[s])
+metrics.add_gauge("naver_api_rate_wait_seconds", "Time spent waiting on the Naver API rate limit.", lambda: naver_rate.waited)
+for _stat in http.stats():
+    metrics.add_gauge(f"http_client_{_stat}", f"Outbound HTTP client {_stat.replace('_', ' ')}.", lambda s=_stat: http.stats()[s])
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(await metrics.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/search", response_model=NewsResponse)
-def search_news(query, display):
+async def search_news(query, display):
     """
     네이버 뉴스 검색 및 본문 추출
     """
 
-    search_result = search_naver_news(query, display)
+    async def compute():
+        items = await search_items(query, display)
+        # 모든 링크를 병렬로 가져온 뒤 검색 순위대로 조립
+        failed = set()
+        texts = await fetch_articles([item['link'] for item in items], failed=failed)
+        return search_result(items, texts, failed)
+
+    return await search_cache.get_or_compute(search_key(query, display), compute, ttl=search_result_ttl)
+
+
+@app.get("/search/stream")
+async def search_news_stream(query, display):
+    """
+    네이버 뉴스 검색 결과를 본문이 추출되는 대로 한 줄씩 내보내는 NDJSON 스트림
+
+    {"type": "article", "rank": 검색 순위(1부터), "title": ..., "link": ..., "text": ...}  (준비된 순서)
+    {"type": "summary", "total": 본문 있는 기사 수, "requested": 검색 결과 수, "cached": bool, "elapsed_ms": ...}
+    """
+    started = time.perf_counter()
+    key = search_key(query, display)
+    cached = search_cache.get(key)
+    # 검색 API 오류는 스트림을 시작하기 전에 일반 HTTP 오류로 돌려준다
+    items = None if cached is not None else await search_items(query, display)
+
+    async def lines():
+        if cached is not None:
+            for rank, news in enumerate(cached["articles"], 1):
+                yield _ndjson({"type": "article", "rank": rank, **news})
+            requested, total = cached["requested"], cached["total"]
+        else:
+            links = [item['link'] for item in items]
+            texts: dict[str, Optional[str]] = {}
+            failed = set()
+            async for link, text in iter_articles(links, failed=failed):
+                texts[link] = text
+                if text is None:
+                    continue
+                for rank, item in enumerate(items, 1):
+                    if item['link'] == link:
+                        yield _ndjson({"type": "article", "rank": rank, **news_article(item, text)})
+            # 끝까지 보낸 결과는 /search와 같은 캐시에 넣어 둔다
+            result = search_result(items, texts, failed)
+            search_cache.put(key, result, ttl=search_result_ttl(result))
+            requested, total = result["requested"], result["total"]
+        yield _ndjson({
+            "type": "summary",
+            "total": total,
+            "requested": requested,
+            "cached": cached is not None,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _ndjson(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+async def search_items(query, display) -> List[dict]:
+    """네이버 검색 API 결과의 items (형식이 이상하면 500)
+
+    display가 API 한도(100)보다 크면 collect_naver_news로 여러 페이지를 모은다 (link 기준 중복 제거, 최대 1000).
+    """
+    if str(display).strip().isdigit() and int(display) > MAX_DISPLAY:
+        return [item async for item in collect_naver_news(query, limit=int(display))]
+
+    search_result = await search_naver_news_async(query, display)
 
     if "items" not in search_result:
         raise HTTPException(
             status_code=500, detail="Invalid response from Naver API"
         )
+    return search_result["items"]
+
+
+def news_article(item: dict, text: str) -> dict:
+    """검색 결과 item 하나 + 본문 -> NewsArticle 형태 (제목의 <b> 강조 태그 제거)"""
+    news = {}
+    title = item['title']
+    if '<b>' in title:
+        title = title.replace('<b>','')
+    if '</b>' in title:
+        title = title.replace('</b>','')
+    news['title'] = title
+    news['link'] = item['link']
+    news['text'] = text
+    return news
+
+
+def build_news_response(items: List[dict], texts: List[Optional[str]]):
+    """검색 결과와 본문 목록을 응답 형태로 조립 (본문이 없는 기사는 제외)"""
 
     ################################################
     ######### 필수 과제 - 문제 1: 네이버 뉴스 링크만 필터링
     news_list = []
 
-    for item in search_result['items']:
-        news = {}
-        if fetch_article_text(item['link']) != None:
-            title = item['title']
-            if '<b>' in title:
-                title = title.replace('<b>','')
-            if '</b>' in title:
-                title = title.replace('</b>','')
-            news['title'] = title
-            news['link'] = item['link']
-            news['text'] = fetch_article_text(item['link'])
-            news_list.append(news)
+    for item, text in zip(items, texts):
+        if text != None:
+            news_list.append(news_article(item, text))
 
     """
     new_list의 각 item 예시:
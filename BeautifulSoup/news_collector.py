@@ -0,0 +1,70 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable
+
+# 네이버 뉴스 검색 API 제한: 한 번에 최대 100개, start는 최대 1000
+MAX_DISPLAY = 100
+MAX_START = 1000
+
+# fetch_page(start, display) -> 검색 API 응답 JSON ({"total": ..., "items": [...]})
+FetchPage = Callable[[int, int], Awaitable[dict]]
+
+
+async def collect_news(
+    fetch_page: FetchPage,
+    limit: int = 1000,
+    page_size: int = MAX_DISPLAY,
+    concurrency: int = 4,
+) -> AsyncIterator[dict]:
+    """검색 결과를 여러 페이지(start 오프셋)에 걸쳐 모아 순위대로 하나씩 내보내는 async generator
+
+    - 첫 페이지로 total을 안 뒤 concurrency개 페이지를 동시에 요청하고, 앞 페이지부터 순서대로 내보낸다
+      (메모리에는 진행 중인 페이지들만 있다)
+    - link / originallink가 이미 나온 기사는 건너뛰고, 건너뛴 만큼 뒤 페이지를 더 가져와 limit개를 채운다
+      (API 상한 start <= 1000까지만)
+    - 응답의 total보다 뒤쪽 페이지는 요청하지 않고, 빈 페이지가 나오면 멈춘다
+    - 호출 속도 제한은 fetch_page 쪽(토큰 버킷)에서 건다
+    """
+    page_size = max(1, min(page_size, MAX_DISPLAY))
+    window: list[asyncio.Task] = []
+    seen: set[str] = set()
+    total = None
+    next_start = 1
+    yielded = 0
+    skipped = 0
+
+    def request(start: int):
+        nonlocal next_start
+        window.append(asyncio.create_task(fetch_page(start, page_size)))
+        next_start = start + page_size
+
+    def fill():
+        # 지금까지 건너뛴 중복 수만큼 더 필요하다
+        wanted = limit + skipped if total is None else min(limit + skipped, total)
+        while len(window) < max(1, concurrency) and next_start <= min(wanted, MAX_START):
+            request(next_start)
+
+    try:
+        request(1)
+        while window:
+            result = await window.pop(0)
+            items = result.get("items") or []
+            if total is None and "total" in result:
+                total = result["total"]
+            if not items:
+                break
+            fill()
+            for item in items:
+                keys = [key for key in (item.get("link"), item.get("originallink")) if key]
+                if any(key in seen for key in keys):
+                    skipped += 1
+                    continue
+                seen.update(keys)
+                yield item
+                yielded += 1
+                if yielded >= limit:
+                    return
+            fill()
+    finally:
+        for task in window:
+            task.cancel()
+        await asyncio.gather(*window, return_exceptions=True)
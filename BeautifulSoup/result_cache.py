@@ -0,0 +1,120 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at);
+"""
+
+
+def content_key(kind: str, *parts) -> str:
+    """내용 기반 캐시 키: kind + 각 부분(bytes는 그대로, 나머지는 정렬된 JSON)의 SHA-256
+
+    같은 모델/프롬프트/뉴스 목록이면 몇 번을 다시 만들어도 같은 키가 나온다.
+    부분마다 길이를 앞에 붙여서 ("ab", "c")와 ("a", "bc")가 섞이지 않게 한다.
+    """
+    digest = hashlib.sha256(kind.encode("utf-8"))
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            data = bytes(part)
+        else:
+            data = json.dumps(part, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return f"{kind}:{digest.hexdigest()}"
+
+
+class ResultCache:
+    """LLM 분석 / STT 결과 같은 비싼 API 결과를 content_key로 저장하는 디스크 캐시 (SQLite, 스레드 안전)
+
+    재시작해도 남고, 저장된 값의 총 크기가 max_bytes를 넘으면 가장 오래 안 쓴 항목부터 지운다.
+    적중/실패 횟수는 kind(키의 ':' 앞부분)별로 센다 (프로세스 시작 이후).
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._bytes = self._conn.execute("SELECT coalesce(sum(size), 0) FROM results").fetchone()[0]
+        self.hits: dict[str, int] = defaultdict(int)
+        self.misses: dict[str, int] = defaultdict(int)
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        kind = key.split(":", 1)[0]
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses[kind] += 1
+                return None
+            self._conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (time.time(), key))
+            self.hits[kind] += 1
+            return row[0]
+
+    def put(self, key: str, value: str):
+        kind = key.split(":", 1)[0]
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, kind, value, size, created_at, used_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, value, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # 최근에 안 쓴 순서로 지워서 max_bytes의 90%까지 줄인다 (put마다 지우지 않도록 여유를 둠)
+        target = self.max_bytes * 0.9
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY used_at"):
+            if self._bytes <= target:
+                break
+            victims.append((key,))
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT count(*) FROM results").fetchone()[0]
+            kinds = sorted(set(self.hits) | set(self.misses))
+            return {
+                "entries": entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "kinds": {kind: {"hits": self.hits[kind], "misses": self.misses[kind]} for kind in kinds},
+            }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
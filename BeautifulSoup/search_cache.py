@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Optional
+
+
+def search_key(query: str, display, sort: str = "sim") -> tuple:
+    """검색 캐시 키: 검색어 정규화(NFKC, 대소문자, 공백) + display + sort"""
+    normalized = " ".join(unicodedata.normalize("NFKC", str(query)).casefold().split())
+    return normalized, str(display).strip(), sort
+
+
+class SearchCache:
+    """검색 결과 TTL + 크기 제한 LRU 캐시 + single-flight
+
+    같은 키로 동시에 들어온 요청은 먼저 온 요청의 계산 하나를 같이 기다린다 (coalesced).
+    계산은 별도 task로 돌려서, 먼저 온 요청이 끊겨도 기다리던 요청들은 결과를 받는다.
+    실패한 계산은 캐시하지 않는다. 항목마다 TTL을 따로 줄 수 있다 (기본은 ttl).
+
+    카운터: misses는 캐시에 없던 조회 수, coalesced는 그중 진행 중인 계산에 합류한 수
+    (실제 계산 횟수 = misses - coalesced).
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable):
+        """캐시된 값 (없거나 만료됐으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable],
+        ttl: Optional[Callable[[object], float]] = None,
+    ):
+        """캐시된 값 또는 compute() 결과 (ttl을 주면 계산한 값마다 ttl(value)초만 캐시)"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        # 다른 이벤트 루프(bench/sync_app.py의 asyncio.run)에서 만든 task는 기다릴 수 없다
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(task)
+
+        async def run():
+            try:
+                value = await compute()
+                self.put(key, value, ttl(value) if ttl is not None else None)
+                return value
+            finally:
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+
+        task = asyncio.ensure_future(run())
+        # 기다리던 요청이 모두 끊겨도 "exception was never retrieved" 경고가 나지 않게
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
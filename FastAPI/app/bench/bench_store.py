@@ -0,0 +1,77 @@
+"""ItemStore 마이크로벤치마크
+
+엔드포인트별로 저장소에서 실제로 일어나는 연산의 p50/p99 지연시간을 잰다.
+
+    cd FastAPI/app
+    python -m bench.bench_store                # 10k / 100k / 1M
+    python -m bench.bench_store --sizes 10000 --ops 2000
+"""
+import argparse
+import random
+import time
+
+from common.stats import percentile
+from storage.memory import ItemStore
+
+
+def build_store(n, rng):
+    store = ItemStore()
+    for i in range(n):
+        store.add({
+            "title": f"item-{rng.randrange(n):07d}",
+            "price": round(rng.uniform(0, 100000), 2),
+            "description": None,
+        })
+    return store
+
+
+def timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter_ns()
+        fn(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def run(n, ops, seed=0):
+    rng = random.Random(seed)
+    store = build_store(n, rng)
+    ids = [rng.randrange(1, n + 1) for _ in range(ops)]
+
+    results = {}
+    results["GET /items/{id}"] = timed(store.get, [(i,) for i in ids])
+    results["PUT /items/{id}"] = timed(
+        store.update, [(i, {"price": round(rng.uniform(0, 100000), 2)}) for i in ids]
+    )
+    # 필터 쿼리는 결과 크기가 지연을 지배하므로 좁은 범위로 잰다
+    results["GET /items?title_prefix"] = timed(
+        store.filter, [(f"item-{rng.randrange(n):07d}"[:-2],) for _ in range(ops)]
+    )
+    results["GET /items?min_price&max_price"] = timed(
+        lambda lo: store.filter(None, lo, lo + 10),
+        [(rng.uniform(0, 100000),) for _ in range(ops)],
+    )
+    results["POST /items"] = timed(
+        store.add, [({"title": f"new-{k}", "price": 1.0},) for k in range(ops)]
+    )
+    results["DELETE /items/{id}"] = timed(store.delete, [(i,) for i in dict.fromkeys(ids)])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'items':>9}  {'endpoint':<32} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for n in args.sizes:
+        for endpoint, samples in run(n, args.ops).items():
+            p50 = percentile(samples, 50) / 1000
+            p99 = percentile(samples, 99) / 1000
+            print(f"{n:>9}  {endpoint:<32} {p50:>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
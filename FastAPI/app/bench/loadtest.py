@@ -0,0 +1,187 @@
+"""FastAPI 앱 부하 테스트 (네트워크 없이 ASGI 앱을 프로세스 안에서 직접 호출)
+
+/items, /health, / 에 읽기/쓰기를 섞어서 보내고 처리량과 지연 백분위를 JSON으로 출력한다.
+저장된 baseline과 비교해서 기준보다 느려지면 종료 코드 1로 끝난다.
+
+    cd FastAPI/app
+    python -m bench.loadtest --duration 10 --save-baseline bench/baseline.json
+    python -m bench.loadtest --duration 10 --baseline bench/baseline.json
+
+httpx가 필요하다.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+import main
+from common.stats import percentile
+from routers import items
+
+DEFAULT_MIX = "get_item=50,list_items=15,health=5,root=5,create_item=10,update_item=10,delete_item=5"
+
+
+class Workload:
+    """요청 종류별 호출 함수 모음, 살아 있는 id 목록을 들고 다닌다"""
+
+    def __init__(self, client: httpx.AsyncClient, ids: list[int], rng: random.Random):
+        self.client = client
+        self.ids = ids
+        self.rng = rng
+
+    def _pick_id(self):
+        return self.rng.choice(self.ids) if self.ids else 1
+
+    async def get_item(self):
+        return await self.client.get(f"/items/{self._pick_id()}")
+
+    async def list_items(self):
+        return await self.client.get("/items/", params={"limit": 50})
+
+    async def health(self):
+        return await self.client.get("/health")
+
+    async def root(self):
+        return await self.client.get("/")
+
+    async def create_item(self):
+        resp = await self.client.post("/items/", json={"title": "bench", "price": self.rng.uniform(0, 1000)})
+        if resp.status_code == 200:
+            self.ids.append(resp.json()["id"])
+        return resp
+
+    async def update_item(self):
+        return await self.client.put(f"/items/{self._pick_id()}", json={"price": self.rng.uniform(0, 1000)})
+
+    async def delete_item(self):
+        if not self.ids:
+            return await self.client.delete("/items/0")
+        item_id = self.ids.pop(self.rng.randrange(len(self.ids)))
+        return await self.client.delete(f"/items/{item_id}")
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Workload, name.strip()):
+            raise SystemExit(f"알 수 없는 요청 종류: {name}")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    weights = parse_mix(args.mix)
+    names, cum_weights = list(weights), list(weights.values())
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        rows = [{"title": f"item-{i}", "price": rng.uniform(0, 1000)} for i in range(args.items)]
+        resp = await client.post("/items/bulk", json=rows)
+        ids = [r["id"] for r in resp.json()["results"] if r["status"] == 201]
+        workload = Workload(client, ids, rng)
+
+        latencies = defaultdict(list)
+        statuses = defaultdict(lambda: defaultdict(int))
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, cum_weights)[0]
+                start = time.perf_counter()
+                resp = await getattr(workload, name)()
+                latencies[name].append(time.perf_counter() - start)
+                statuses[name][resp.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await items.repository.close()
+
+    report = {
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "items": args.items,
+            "mix": weights,
+        },
+        "total": {
+            "requests": sum(len(v) for v in latencies.values()),
+            "throughput_rps": sum(len(v) for v in latencies.values()) / elapsed,
+        },
+        "endpoints": {},
+    }
+    for name, samples in sorted(latencies.items()):
+        report["endpoints"][name] = {
+            "requests": len(samples),
+            "throughput_rps": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p90_ms": percentile(samples, 90) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "max_ms": max(samples) * 1000,
+            "status": {str(code): count for code, count in sorted(statuses[name].items())},
+        }
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """baseline 대비 tolerance(비율) 이상 나빠진 항목 목록"""
+    regressions = []
+    base_rps = baseline["total"]["throughput_rps"]
+    if report["total"]["throughput_rps"] < base_rps * (1 - tolerance):
+        regressions.append(f"total throughput {report['total']['throughput_rps']:.0f} < baseline {base_rps:.0f} rps")
+
+    for name, base in baseline["endpoints"].items():
+        current = report["endpoints"].get(name)
+        if current is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric} {current[metric]:.2f} > baseline {base[metric]:.2f}")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0, help="초")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--items", type=int, default=10000, help="시작 전에 넣어 둘 아이템 수")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="요청종류=가중치,...")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON을 저장할 경로 (기본: stdout)")
+    parser.add_argument("--baseline", help="비교할 baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 저하 비율 (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="이번 결과를 baseline으로 저장")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if report.get("regressions"):
+        print("\n".join(report["regressions"]), file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
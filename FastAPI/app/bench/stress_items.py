@@ -0,0 +1,184 @@
+"""id 할당 / compare-and-set 수정 동시성 스트레스 테스트
+
+1. 스레드: 하나의 ItemStore에 여러 스레드가 동시에 create + version 체크 update
+2. 프로세스: 여러 프로세스(=uvicorn 워커)가 같은 SQLite 파일에 동시에 create + update
+3. 회귀: 1건 추가 -> id 블록보다 큰 벌크 추가 -> 1건 추가 뒤 keyset 페이지로 끝까지 읽기
+
+id 중복이 없고, 모든 증가 연산이 반영됐는지(lost write 없음),
+3은 모든 아이템이 id 순서대로 한 번씩만 나오는지 (메모리 저장소, BlockIdAllocator 각각) 확인한다.
+
+    cd FastAPI/app
+    python -m bench.stress_items
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+
+from storage.ids import BlockIdAllocator
+from storage.memory import ItemStore
+from storage.repository import VersionConflict
+from storage.sqlite import SQLiteItemRepository
+
+
+def _increment_store(store: ItemStore, item_id: int):
+    # 읽고 -> version을 걸고 쓰기, 실패하면 다시 읽어서 재시도
+    while True:
+        item = store.get(item_id)
+        try:
+            store.update(item_id, {"price": item["price"] + 1}, expected_version=item["version"])
+            return
+        except VersionConflict:
+            continue
+
+
+def stress_threads(threads: int, creates: int, increments: int):
+    store = ItemStore()
+    counter = store.add({"title": "counter", "price": 0})
+    created = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads)
+
+    def worker(k):
+        barrier.wait()
+        for i in range(creates):
+            created[k].append(store.add({"title": f"t{k}-{i}", "price": i})["id"])
+            if i < increments:
+                _increment_store(store, counter["id"])
+
+    workers = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    ids = [item_id for ids in created for item_id in ids]
+    return {
+        "created": len(ids),
+        "duplicate_ids": len(ids) - len(set(ids)),
+        "stored": len(store) - 1,
+        "counter": store.get(counter["id"])["price"],
+        "expected_counter": threads * min(creates, increments),
+    }
+
+
+async def _sqlite_worker(path: str, k: int, creates: int, increments: int, counter_id: int):
+    repo = SQLiteItemRepository(path, pool_size=2, id_block_size=64)
+
+    async def increment():
+        while True:
+            item = await repo.get(counter_id)
+            try:
+                await repo.update(counter_id, {"price": item["price"] + 1}, expected_version=item["version"])
+                return
+            except VersionConflict:
+                continue
+
+    created = await asyncio.gather(*(repo.add({"title": f"p{k}-{i}", "price": i}) for i in range(creates)))
+    await asyncio.gather(*(increment() for _ in range(increments)))
+    await repo.close()
+    return [item["id"] for item in created]
+
+
+def _run_sqlite_worker(args):
+    return asyncio.run(_sqlite_worker(*args))
+
+
+def stress_processes(processes: int, creates: int, increments: int):
+    path = os.path.join(tempfile.mkdtemp(), "stress.db")
+
+    async def setup():
+        repo = SQLiteItemRepository(path)
+        counter = await repo.add({"title": "counter", "price": 0})
+        await repo.close()
+        return counter["id"]
+
+    counter_id = asyncio.run(setup())
+
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        created = pool.map(
+            _run_sqlite_worker,
+            [(path, k, creates, increments, counter_id) for k in range(processes)],
+        )
+
+    ids = [item_id for ids in created for item_id in ids]
+    conn = sqlite3.connect(path)
+    stored = conn.execute("SELECT count(*) FROM items").fetchone()[0] - 1
+    counter = conn.execute("SELECT price FROM items WHERE id = ?", (counter_id,)).fetchone()[0]
+    conn.close()
+    return {
+        "created": len(ids),
+        "duplicate_ids": len(ids) - len(set(ids)),
+        "stored": stored,
+        "counter": counter,
+        "expected_counter": processes * increments,
+    }
+
+
+def check_bulk_then_single(block_size: int = 1000, page_size: int = 100):
+    store = ItemStore()
+    store.add({"title": "first", "price": 1})
+    store.add_many([{"title": f"bulk{i}", "price": i} for i in range(block_size + block_size // 2)])
+    last = store.add({"title": "last", "price": 1})
+
+    seen, after = [], None
+    while page := store.page(after=after, limit=page_size):
+        seen.extend(item["id"] for item in page)
+        after = page[-1]["id"]
+
+    # 공유 저장소용 할당기도 큰 예약 뒤에 더 작은 id를 내주면 안 된다
+    next_id = 1
+
+    def reserve(n):
+        nonlocal next_id
+        start, next_id = next_id, next_id + n
+        return start
+
+    ids = BlockIdAllocator(reserve, block_size)
+    allocated = [ids.allocate(1), ids.allocate(block_size + 1), ids.allocate(1)]
+    return {
+        "stored": len(store),
+        "paged": len(seen),
+        "distinct": len(set(seen)),
+        "sorted": seen == sorted(seen),
+        "last_is_max": last["id"] == max(seen),
+        "allocator_monotonic": allocated == sorted(allocated),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--creates", type=int, default=2000)
+    parser.add_argument("--increments", type=int, default=200)
+    args = parser.parse_args()
+
+    failed = False
+    for name, result in (
+        ("threads / memory", stress_threads(args.threads, args.creates, args.increments)),
+        ("processes / sqlite", stress_processes(args.processes, args.creates, args.increments)),
+    ):
+        ok = (
+            result["duplicate_ids"] == 0
+            and result["stored"] == result["created"]
+            and result["counter"] == result["expected_counter"]
+        )
+        failed |= not ok
+        print(f"{name:<20} {'OK' if ok else 'FAIL'}  {result}")
+
+    result = check_bulk_then_single()
+    ok = (
+        result["paged"] == result["distinct"] == result["stored"]
+        and result["sorted"] and result["last_is_max"] and result["allocator_monotonic"]
+    )
+    failed |= not ok
+    print(f"{'bulk then single':<20} {'OK' if ok else 'FAIL'}  {result}")
+
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ResponseCache:
+    """미리 직렬화해 둔 응답(bytes, ETag 등)을 담는 크기 제한 LRU 캐시
+
+    쓰기가 일어나면 pop/clear로 무효화한다. 무효화할 때마다 generation이 올라가므로
+    저장소를 읽는 동안 쓰기가 끼어들었다면 put(..., generation)이 오래된 값을 버린다.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value, generation: Optional[int] = None):
+        if self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
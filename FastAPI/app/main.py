@@ -1,13 +1,31 @@
-from fastapi import FastAPI
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from fastapi import FastAPI, Response
 import uvicorn
 from routers import items
 
+# 저장소 루트의 common 패키지 (BeautifulSoup 앱과 같이 쓰는 메트릭)
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from common.metrics import CONTENT_TYPE, Metrics, MetricsMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await items.repository.close()
+
 app = FastAPI(
     title="My FastAPI APP",
     description="My first APP!",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+metrics = Metrics()
+metrics.add_gauge("items_total", "Items in the store.", items.repository.count)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
 app.include_router(items.router)
 
 @app.get("/")
@@ -20,10 +38,18 @@ async def root():
 async def health_check():
     return {"status":"healthy"}
 
+@app.get("/metrics")
+async def get_metrics():
+    return Response(await metrics.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
+    # 워커를 여러 개 띄우려면 ITEMS_BACKEND=sqlite 로 상태를 공유해야 한다
+    # (sqlite에서는 프로세스별 응답 캐시가 기본으로 꺼져 있다. 워커 1개일 때만 ITEMS_SQLITE_RESPONSE_CACHE=1)
+    workers = int(os.getenv("APP_WORKERS", "1"))
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
         port=8012,
-        reload=True
+        reload=workers == 1,
+        workers=workers
     )
\ No newline at end of file
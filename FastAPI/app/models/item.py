@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ItemBase(BaseModel):
@@ -20,4 +20,18 @@ class ItemResponse(ItemBase):
 class ItemUpdate(BaseModel):
     title: Optional[str] = None #Optional은 없어도 되지만 있다면 str을 받겠다는 뜻
     price: Optional[float] = None
-    description: Optional[str] = None
\ No newline at end of file
+    description: Optional[str] = None
+
+class ItemBulkUpdate(ItemUpdate):
+    id: int
+
+class BulkRowResult(BaseModel):
+    index: int # 요청 배열(또는 NDJSON 줄)에서의 위치
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkRowResult]
\ No newline at end of file
@@ -1,61 +1,295 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from datetime import datetime
-from models.item import ItemCreate, ItemResponse, ItemUpdate
+import hashlib
+import json
+import os
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from typing import List, Optional
+from models.item import (
+    BulkResponse,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemResponse,
+    ItemUpdate,
+)
+from cache import ResponseCache
+from storage.repository import VersionConflict, create_repository
 
 router = APIRouter(prefix="/items", tags=["items"])
 
-fake_items_db = []
-item_id_counter = 1
+repository = create_repository()
+
+def _cache_size(name: str, default: int) -> int:
+    """응답 캐시 크기
+
+    캐시는 프로세스별이라 sqlite를 여러 워커가 공유하면 다른 워커의 쓰기를 알 수 없어서
+    오래된 200/잘못된 304를 주게 된다. 워커 수는 uvicorn --workers로도 바뀌어서 여기서 알 수 없으므로,
+    sqlite 백엔드에서는 ITEMS_SQLITE_RESPONSE_CACHE=1로 워커 1개임을 밝혔을 때만 캐시를 쓴다
+    (APP_WORKERS > 1이면 그래도 끈다).
+    """
+    if os.getenv("ITEMS_BACKEND", "memory") == "sqlite":
+        opted_in = os.getenv("ITEMS_SQLITE_RESPONSE_CACHE") == "1"
+        if not opted_in or int(os.getenv("APP_WORKERS", "1")) > 1:
+            return 0
+    return int(os.getenv(name, str(default)))
+
+# 직렬화된 응답 캐시 (프로세스별)
+item_cache = ResponseCache(_cache_size("ITEMS_CACHE_SIZE", 10000))
+page_cache = ResponseCache(_cache_size("ITEMS_PAGE_CACHE_SIZE", 1000))
+
+_item_adapter = TypeAdapter(ItemResponse)
+_page_adapter = TypeAdapter(List[ItemResponse])
+
+def _etag(item: dict) -> str:
+    return f'"{item["id"]}-{item["version"]}"'
+
+def _expected_version(if_match: Optional[str], item_id: int) -> Optional[int]:
+    """If-Match 헤더("<id>-<version>")에서 기대하는 version을 꺼낸다 (* 이나 없으면 None)"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    tag = if_match.split(",")[0].strip().removeprefix("W/").strip('"')
+    tag_id, _, version = tag.partition("-")
+    if tag_id != str(item_id) or not version.isdigit():
+        raise HTTPException(status_code=412, detail="If-Match가 이 아이템의 ETag가 아닙니다")
+    return int(version)
+
+def _not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def _cached_response(request: Request, body: bytes, etag: str, headers: Optional[dict] = None) -> Response:
+    """캐시된 bytes를 그대로 응답, If-None-Match가 맞으면 본문 없이 304"""
+    headers = {"ETag": etag, **(headers or {})}
+    if _not_modified(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _invalidate(item_ids=()):
+    for item_id in item_ids:
+        item_cache.pop(item_id)
+    page_cache.clear()
+
+def _item_json(item: dict) -> bytes:
+    # GET /items, GET /items/{id}와 같은 ItemResponse 스키마로 (version 같은 내부 필드는 빠진다)
+    return _item_adapter.dump_json(_item_adapter.validate_python(item))
+
+async def _stream_items(title_prefix, min_price, max_price, cursor, chunk_size):
+    """NDJSON 스트리밍: chunk_size개씩 keyset으로 끊어 읽으면서 바로 흘려보낸다"""
+    while True:
+        items = await repository.page(title_prefix, min_price, max_price, after=cursor, limit=chunk_size)
+        if not items:
+            return
+        yield b"".join(_item_json(item) + b"\n" for item in items)
+        cursor = items[-1]["id"]
 
 @router.get("/", response_model=List[ItemResponse])
-async def get_items():
-    return fake_items_db
+async def get_items(
+    request: Request,
+    title_prefix: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    stream: bool = False,
+):
+    # stream=true면 cursor 이후 전체를 NDJSON으로 내보낸다 (limit은 청크 크기)
+    if stream:
+        return StreamingResponse(
+            _stream_items(title_prefix, min_price, max_price, cursor, limit),
+            media_type="application/x-ndjson",
+        )
+
+    key = (title_prefix, min_price, max_price, limit, cursor)
+    cached = page_cache.get(key)
+    if cached is None:
+        generation = page_cache.generation
+        items = await repository.page(title_prefix, min_price, max_price, after=cursor, limit=limit + 1)
+        headers = {}
+        if len(items) > limit:
+            items = items[:limit]
+            headers["X-Next-Cursor"] = str(items[-1]["id"])
+        body = _page_adapter.dump_json(_page_adapter.validate_python(items))
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        cached = (body, etag, headers)
+        page_cache.put(key, cached, generation)
+    return _cached_response(request, *cached)
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    return {"item": item_cache.stats(), "page": page_cache.stats()}
 
 @router.post("/", response_model=ItemResponse) #post는 원래 없던 것
-async def create_items(item: ItemCreate):
-    global item_id_counter
+async def create_items(item: ItemCreate, response: Response):
+    new_item = await repository.add(item.dict())
+    _invalidate()
+    response.headers["ETag"] = _etag(new_item)
+    return new_item
 
-    new_item = {
-        "id": item_id_counter,
-        "title": item.title,
-        "description": item.description,
-        "price": item.price,
-        "created_at": datetime.now()
-    }
+# 벌크 API: 배열 전체를 TypeAdapter로 한 번에 검증하고 행 단위 결과를 돌려준다
+_create_rows = TypeAdapter(list[ItemCreate])
+_update_rows = TypeAdapter(list[ItemBulkUpdate])
+_delete_rows = TypeAdapter(list[int])
 
-    fake_items_db.append(new_item)
-    item_id_counter += 1
+def _validate_rows(adapter: TypeAdapter, raw: list, indexes: list[int], errors: dict) -> dict:
+    """raw 행들을 한 번에 검증해서 {행 번호: 검증된 행} 반환, 실패한 행은 errors[행 번호]에 기록"""
+    try:
+        return dict(zip(indexes, adapter.validate_python(raw)))
+    except ValidationError as e:
+        bad = {}
+        for error in e.errors():
+            if not error["loc"] or not isinstance(error["loc"][0], int):
+                raise RequestValidationError(e.errors())
+            bad.setdefault(error["loc"][0], error["msg"])
 
-    return new_item
+    # 에러가 없는 행만 모아서 다시 검증 (실패한 요청에서만 타는 경로)
+    keep = [n for n in range(len(raw)) if n not in bad]
+    for n, msg in bad.items():
+        errors[indexes[n]] = msg
+    return dict(zip((indexes[n] for n in keep), adapter.validate_python([raw[n] for n in keep])))
+
+async def _read_rows(request: Request, adapter: TypeAdapter):
+    """JSON 배열 또는 NDJSON 본문을 읽어 ([(행 번호, 검증된 행 또는 None)], 행별 에러) 반환
+
+    NDJSON은 한 줄씩 파싱하고 행 번호 = 줄 번호(0부터)다. 빈 줄은 건너뛰고(번호는 차지함),
+    JSON으로 읽을 수 없는 줄(한 줄에 값이 둘 이상인 것 포함)은 그 행만 에러로 기록한다.
+    일부 행만 잘못된 경우 나머지 행은 그대로 처리할 수 있도록 에러를 행 번호로 모은다.
+    """
+    body = await request.body()
+    errors = {}
+    if "ndjson" in request.headers.get("content-type", ""):
+        raw, indexes = [], []
+        for i, line in enumerate(body.splitlines()):
+            if not line.strip():
+                continue
+            try:
+                raw.append(json.loads(line))
+            except ValueError as e:
+                errors[i] = f"Invalid JSON: {e}"
+                continue
+            indexes.append(i)
+        valid = _validate_rows(adapter, raw, indexes, errors)
+        return sorted([*valid.items(), *((i, None) for i in errors)]), errors
+
+    try:
+        return list(enumerate(adapter.validate_json(body))), errors
+    except ValidationError as e:
+        # 배열 자체를 읽을 수 없으면 행 단위로 나눌 수 없으므로 요청 전체가 422
+        if any(not error["loc"] or not isinstance(error["loc"][0], int) for error in e.errors()):
+            raise RequestValidationError(e.errors())
+    raw = json.loads(body)
+    valid = _validate_rows(adapter, raw, list(range(len(raw))), errors)
+    return [(i, valid.get(i)) for i in range(len(raw))], errors
+
+def _bulk_response(results: list[dict]) -> JSONResponse:
+    # 행이 수십만 개일 수 있어 BulkResponse 검증을 건너뛰고 바로 직렬화한다
+    failed = sum(1 for r in results if r["status"] >= 400)
+    return JSONResponse({
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    })
+
+@router.post("/bulk", response_model=BulkResponse)
+async def create_items_bulk(request: Request):
+    rows, errors = await _read_rows(request, _create_rows)
+
+    valid = _create_rows.dump_python([row for _, row in rows if row is not None])
+    created = iter(await repository.add_many(valid))
+    _invalidate()
+
+    results = []
+    for i, row in rows:
+        if row is None:
+            results.append({"index": i, "status": 422, "detail": errors[i]})
+        else:
+            results.append({"index": i, "id": next(created)["id"], "status": 201})
+    return _bulk_response(results)
+
+@router.patch("/bulk", response_model=BulkResponse)
+async def update_items_bulk(request: Request):
+    rows, errors = await _read_rows(request, _update_rows)
+
+    updates = [
+        (row.id, row.model_dump(exclude_unset=True, exclude={"id"}))
+        for _, row in rows if row is not None
+    ]
+    updated = iter(await repository.update_many(updates))
+    _invalidate(item_id for item_id, _ in updates)
+
+    results = []
+    for i, row in rows:
+        if row is None:
+            results.append({"index": i, "status": 422, "detail": errors[i]})
+        elif next(updated) is None:
+            results.append({"index": i, "id": row.id, "status": 404, "detail": "Item not found"})
+        else:
+            results.append({"index": i, "id": row.id, "status": 200})
+    return _bulk_response(results)
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def delete_items_bulk(request: Request):
+    item_ids, errors = await _read_rows(request, _delete_rows)
+
+    valid_ids = [item_id for _, item_id in item_ids if item_id is not None]
+    deleted = iter(await repository.delete_many(valid_ids))
+    _invalidate(valid_ids)
+
+    results = []
+    for i, item_id in item_ids:
+        if item_id is None:
+            results.append({"index": i, "status": 422, "detail": errors[i]})
+        elif next(deleted) is None:
+            results.append({"index": i, "id": item_id, "status": 404, "detail": "Item not found"})
+        else:
+            results.append({"index": i, "id": item_id, "status": 200})
+    return _bulk_response(results)
 
 @router.get("/{item_id}", response_model=ItemResponse)
-async def get_item(item_id: int):
-    for item in fake_items_db:
-        if item["id"] == item_id:
-            return item
-        
+async def get_item(item_id: int, request: Request):
+    cached = item_cache.get(item_id)
+    if cached is None:
+        generation = item_cache.generation
+        item = await repository.get(item_id)
+        if item is not None:
+            cached = (_item_adapter.dump_json(_item_adapter.validate_python(item)), _etag(item))
+            item_cache.put(item_id, cached, generation)
+    if cached is not None:
+        return _cached_response(request, *cached)
+
     raise HTTPException(status_code=404, detail="Item not found")
 
 @router.put("/{item_id}", response_model=ItemResponse) #put은 원래 있던 것
-async def update_item(item_id: int, item_update: ItemUpdate):
-    for i, item in enumerate(fake_items_db):
-        if item["id"] == item_id:
-            update_data = item_update.dict(exclude_unset=True)
-            fake_items_db[i].update(update_data)
-
-            return fake_items_db[i]
-        
+async def update_item(
+    item_id: int,
+    item_update: ItemUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+):
+    update_data = item_update.dict(exclude_unset=True)
+    try:
+        item = await repository.update(item_id, update_data, _expected_version(if_match, item_id))
+    except VersionConflict as e:
+        # 그 사이 다른 요청이 먼저 수정함 -> 최신 ETag를 주고 다시 시도하게 한다
+        raise HTTPException(status_code=412, detail="update_item 실패: version 불일치", headers={"ETag": _etag(e.current)})
+    _invalidate([item_id])
+    if item is not None:
+        response.headers["ETag"] = _etag(item)
+        return item
+
     raise HTTPException(status_code=404, detail="update_item 실패")
 
 @router.delete("/{item_id}")
 async def delete_item(item_id: int):
-    for i, item in enumerate(fake_items_db):
-        if item["id"] == item_id:
-            delete_item = fake_items_db.pop(i)
-
-            return {
-                "message": f"item {delete_item["title"]}가 성공적으로 삭제됐습니다."
-            }
-        
-    raise HTTPException(status_code=404, detail="Item not found")
\ No newline at end of file
+    delete_item = await repository.delete(item_id)
+    _invalidate([item_id])
+    if delete_item is not None:
+        return {
+            "message": f"item {delete_item['title']}가 성공적으로 삭제됐습니다."
+        }
+
+    raise HTTPException(status_code=404, detail="Item not found")
@@ -0,0 +1,37 @@
+import threading
+from typing import Callable
+
+
+class BlockIdAllocator:
+    """id를 블록 단위로 예약해 두고 나눠주는 할당기 (스레드 안전)
+
+    reserve(n)은 n개의 연속된 id를 예약하고 시작 id를 반환해야 한다.
+    공유 저장소(SQLite 등)에 대한 reserve 호출은 block_size개마다 한 번만 일어나므로
+    여러 워커가 insert마다 같은 카운터를 두고 경쟁하지 않는다.
+    """
+
+    def __init__(self, reserve: Callable[[int], int], block_size: int = 1000):
+        self._reserve = reserve
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def remaining(self) -> int:
+        """현재 블록에 남은 id 개수 (0이면 다음 allocate가 reserve를 호출한다)"""
+        return self._end - self._next
+
+    def allocate(self, n: int = 1) -> int:
+        """연속된 n개의 id를 할당하고 시작 id를 반환"""
+        with self._lock:
+            if n > self._end - self._next:
+                if n >= self.block_size:
+                    # 블록보다 큰 요청은 따로 예약하고 남은 블록은 버린다
+                    # (남겨 두면 다음 작은 요청이 이 범위보다 작은 id를 받아 발급 순서가 뒤집힌다)
+                    self._next = self._end
+                    return self._reserve(n)
+                self._next = self._reserve(self.block_size)
+                self._end = self._next + self.block_size
+            start = self._next
+            self._next += n
+            return start
@@ -0,0 +1,273 @@
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from storage.repository import ItemRepository, VersionConflict
+
+# prefix 검색 상한값으로 쓰는 가장 큰 유니코드 문자
+_MAX_CHAR = "\U0010ffff"
+
+# 이 개수 이상이면 벌크 작업에서 인덱스를 건별이 아니라 통째로 갱신
+_BULK_THRESHOLD = 256
+
+# 필터별로 기억해 두는 정렬된 후보 id 목록 수 (스트리밍/페이지 넘김이 매번 다시 정렬하지 않도록)
+_CANDIDATE_CACHE_SIZE = 8
+
+
+class ItemStore:
+    """id 기준 dict + 보조 인덱스를 가진 인메모리 아이템 저장소
+
+    - _items: id -> item dict (조회/수정/삭제 O(1))
+    - _order: 삽입 순서대로 쌓이는 id 목록 (삭제는 tombstone 처리 후 모아서 정리)
+    - _title_index, _price_index: (key, id) 정렬 리스트, bisect로 범위 검색
+
+    쓰기는 _lock으로 직렬화하고, 수정은 dict를 새로 만들어 교체(copy-on-write)하므로
+    스레드에서 호출해도 id가 겹치거나 읽는 쪽이 반쯤 바뀐 아이템을 보지 않는다.
+
+    필터 조회의 정렬된 후보 id 목록은 쓰기 세대(_generation)와 같이 기억해 두고,
+    다음 페이지는 그 목록에서 cursor 위치만 bisect로 찾는다 (쓰기가 있으면 다시 만든다).
+    """
+
+    def __init__(self):
+        self._items: dict[int, dict] = {}
+        self._order: list[int] = []
+        self._dead = 0
+        self._title_index: list[tuple[str, int]] = []
+        self._price_index: list[tuple[float, int]] = []
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._candidate_cache: OrderedDict[tuple, tuple[int, list[int]]] = OrderedDict()
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, item_id: int) -> Optional[dict]:
+        return self._items.get(item_id)
+
+    def add(self, data: dict) -> dict:
+        return self.add_many([data])[0]
+
+    def add_many(self, rows: list[dict]) -> list[dict]:
+        """여러 아이템을 한 번에 추가 (id는 _lock 안에서 _next_id부터 연속으로 발급)"""
+        with self._lock:
+            return self._add_many(rows)
+
+    def _add_many(self, rows: list[dict]) -> list[dict]:
+        self._generation += 1
+        start = self._next_id
+        self._next_id += len(rows)
+        now = datetime.now()
+
+        new_items = [
+            {
+                "id": start + i,
+                "title": data["title"],
+                "description": data.get("description"),
+                "price": data["price"],
+                "created_at": now,
+                "version": 1,
+            }
+            for i, data in enumerate(rows)
+        ]
+        for item in new_items:
+            self._items[item["id"]] = item
+        self._order.extend(item["id"] for item in new_items)
+
+        if len(new_items) < _BULK_THRESHOLD:
+            for item in new_items:
+                self._index(item)
+        else:
+            # 건별 insort 대신 붙이고 한 번에 정렬 (timsort는 정렬된 구간을 그대로 활용)
+            self._title_index.extend((item["title"].casefold(), item["id"]) for item in new_items)
+            self._title_index.sort()
+            self._price_index.extend((item["price"], item["id"]) for item in new_items)
+            self._price_index.sort()
+        return new_items
+
+    def update(self, item_id: int, data: dict, expected_version: Optional[int] = None) -> Optional[dict]:
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None:
+                return None
+            if expected_version is not None and item["version"] != expected_version:
+                raise VersionConflict(item)
+
+            # title/price는 인덱스 키라서 None으로 덮어쓰지 않는다
+            data = {k: v for k, v in data.items() if v is not None or k not in ("title", "price")}
+            new_item = {**item, **data, "id": item_id, "version": item["version"] + 1}
+
+            self._generation += 1
+            self._unindex(item)
+            self._items[item_id] = new_item
+            self._index(new_item)
+            return new_item
+
+    def delete(self, item_id: int) -> Optional[dict]:
+        with self._lock:
+            return self._delete(item_id)
+
+    def _delete(self, item_id: int) -> Optional[dict]:
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return None
+
+        self._generation += 1
+        self._unindex(item)
+        self._dead += 1
+        # tombstone이 절반을 넘으면 순서 목록을 한 번에 정리
+        if self._dead > len(self._order) // 2:
+            self._order = [i for i in self._order if i in self._items]
+            self._dead = 0
+        return item
+
+    def delete_many(self, item_ids: list[int]) -> list[Optional[dict]]:
+        """여러 아이템 삭제, 없는 id 자리는 None"""
+        with self._lock:
+            return self._delete_many(item_ids)
+
+    def _delete_many(self, item_ids: list[int]) -> list[Optional[dict]]:
+        if len(item_ids) < _BULK_THRESHOLD:
+            return [self._delete(item_id) for item_id in item_ids]
+
+        self._generation += 1
+        deleted = [self._items.pop(item_id, None) for item_id in item_ids]
+        gone = {item["id"] for item in deleted if item is not None}
+        # 인덱스와 순서 목록을 건별 del 대신 한 번씩만 다시 만든다
+        self._title_index = [e for e in self._title_index if e[1] not in gone]
+        self._price_index = [e for e in self._price_index if e[1] not in gone]
+        self._order = [i for i in self._order if i in self._items]
+        self._dead = 0
+        return deleted
+
+    def page(
+        self,
+        title_prefix: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """id > after 인 아이템을 최대 limit개 반환 (keyset 페이지네이션)
+
+        id는 _lock 안에서 _next_id를 늘려 가며 발급하고 _order에는 발급 순서대로 붙이므로
+        _order는 항상 정렬되어 있고, cursor 위치를 bisect로 바로 찾을 수 있다.
+        """
+        if title_prefix is None and min_price is None and max_price is None:
+            order = self._order
+            start = bisect_left(order, after + 1) if after is not None else 0
+            ids = (order[i] for i in range(start, len(order)))
+        else:
+            candidates = self._candidates(title_prefix, min_price, max_price)
+            start = bisect_left(candidates, after + 1) if after is not None else 0
+            ids = (candidates[i] for i in range(start, len(candidates)))
+
+        result = []
+        for item_id in ids:
+            item = self._items.get(item_id)
+            if item is None or not self._matches(item, title_prefix, min_price, max_price):
+                continue
+            result.append(item)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def filter(
+        self,
+        title_prefix: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        """title prefix / 가격 범위로 필터링 (id 오름차순)"""
+        return self.page(title_prefix, min_price, max_price)
+
+    def _candidates(self, title_prefix, min_price, max_price) -> list[int]:
+        """두 인덱스 중 후보가 적은 쪽으로 범위를 좁힌 id 목록 (정렬됨, 호출한 쪽에서 수정하지 말 것)"""
+        key = (title_prefix.casefold() if title_prefix is not None else None, min_price, max_price)
+        with self._lock:
+            generation = self._generation
+            cached = self._candidate_cache.get(key)
+            if cached is not None and cached[0] == generation:
+                self._candidate_cache.move_to_end(key)
+                return cached[1]
+            candidates = self._build_candidates(title_prefix, min_price, max_price)
+            self._candidate_cache[key] = (generation, candidates)
+            self._candidate_cache.move_to_end(key)
+            while len(self._candidate_cache) > _CANDIDATE_CACHE_SIZE:
+                self._candidate_cache.popitem(last=False)
+            return candidates
+
+    def _build_candidates(self, title_prefix, min_price, max_price) -> list[int]:
+        ranges = []
+        if title_prefix is not None:
+            key = title_prefix.casefold()
+            idx = self._title_index
+            lo = bisect_left(idx, (key,))
+            hi = bisect_left(idx, (key + _MAX_CHAR,))
+            ranges.append((hi - lo, idx, lo, hi))
+        if min_price is not None or max_price is not None:
+            idx = self._price_index
+            lo = 0 if min_price is None else bisect_left(idx, (min_price,))
+            hi = len(idx) if max_price is None else bisect_left(idx, (max_price, float("inf")))
+            ranges.append((hi - lo, idx, lo, hi))
+
+        _, idx, lo, hi = min(ranges, key=lambda r: r[0])
+        return sorted(item_id for _, item_id in idx[lo:hi])
+
+    @staticmethod
+    def _matches(item, title_prefix, min_price, max_price) -> bool:
+        if title_prefix is not None and not item["title"].casefold().startswith(title_prefix.casefold()):
+            return False
+        if min_price is not None and item["price"] < min_price:
+            return False
+        if max_price is not None and item["price"] > max_price:
+            return False
+        return True
+
+    def _index(self, item: dict):
+        insort(self._title_index, (item["title"].casefold(), item["id"]))
+        insort(self._price_index, (item["price"], item["id"]))
+
+    def _unindex(self, item: dict):
+        for idx, key in (
+            (self._title_index, item["title"].casefold()),
+            (self._price_index, item["price"]),
+        ):
+            i = bisect_left(idx, (key, item["id"]))
+            del idx[i]
+
+
+class MemoryItemRepository(ItemRepository):
+    """ItemStore를 감싼 프로세스 내부 저장소 (워커 1개 전용)"""
+
+    def __init__(self):
+        self.store = ItemStore()
+
+    async def get(self, item_id):
+        return self.store.get(item_id)
+
+    async def page(self, title_prefix=None, min_price=None, max_price=None, after=None, limit=None):
+        return self.store.page(title_prefix, min_price, max_price, after, limit)
+
+    async def add(self, data):
+        return self.store.add(data)
+
+    async def add_many(self, rows):
+        return self.store.add_many(rows)
+
+    async def update(self, item_id, data, expected_version=None):
+        return self.store.update(item_id, data, expected_version)
+
+    async def update_many(self, updates):
+        return [self.store.update(item_id, data) for item_id, data in updates]
+
+    async def delete(self, item_id):
+        return self.store.delete(item_id)
+
+    async def delete_many(self, item_ids):
+        return self.store.delete_many(item_ids)
+
+    async def count(self):
+        return len(self.store)
@@ -0,0 +1,78 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class VersionConflict(Exception):
+    """If-Match로 받은 version과 저장된 version이 다를 때 (compare-and-set 실패)"""
+
+    def __init__(self, current: dict):
+        super().__init__(f"item {current['id']} is at version {current['version']}")
+        self.current = current
+
+
+class ItemRepository(ABC):
+    """아이템 저장소 인터페이스
+
+    라우터는 이 메서드들만 사용하므로 백엔드(메모리/SQLite)를 바꿔 끼울 수 있다.
+    반환값은 ItemResponse 필드 + version을 가진 dict.
+    반환된 dict는 수정하지 않는다 (update는 항상 새 dict를 만든다).
+    """
+
+    @abstractmethod
+    async def get(self, item_id: int) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def page(
+        self,
+        title_prefix: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]: ...
+
+    @abstractmethod
+    async def add(self, data: dict) -> dict: ...
+
+    @abstractmethod
+    async def add_many(self, rows: list[dict]) -> list[dict]: ...
+
+    @abstractmethod
+    async def update(self, item_id: int, data: dict, expected_version: Optional[int] = None) -> Optional[dict]:
+        """expected_version이 주어지면 현재 version과 같을 때만 수정, 다르면 VersionConflict"""
+
+    @abstractmethod
+    async def update_many(self, updates: list[tuple[int, dict]]) -> list[Optional[dict]]: ...
+
+    @abstractmethod
+    async def delete(self, item_id: int) -> Optional[dict]: ...
+
+    @abstractmethod
+    async def delete_many(self, item_ids: list[int]) -> list[Optional[dict]]: ...
+
+    @abstractmethod
+    async def count(self) -> int: ...
+
+    async def close(self):
+        pass
+
+
+def create_repository() -> ItemRepository:
+    """환경변수 ITEMS_BACKEND(memory | sqlite)에 맞는 저장소 생성
+
+    여러 uvicorn 워커가 같은 데이터를 봐야 하면 sqlite를 써야 한다.
+    """
+    backend = os.getenv("ITEMS_BACKEND", "memory")
+
+    if backend == "memory":
+        from storage.memory import MemoryItemRepository
+        return MemoryItemRepository()
+    if backend == "sqlite":
+        from storage.sqlite import SQLiteItemRepository
+        return SQLiteItemRepository(
+            os.getenv("ITEMS_DB_PATH", "items.db"),
+            pool_size=int(os.getenv("ITEMS_DB_POOL_SIZE", "4")),
+        )
+
+    raise ValueError(f"알 수 없는 ITEMS_BACKEND: {backend}")
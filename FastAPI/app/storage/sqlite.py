@@ -0,0 +1,317 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+
+from storage.ids import BlockIdAllocator
+from storage.memory import _MAX_CHAR
+from storage.repository import ItemRepository, VersionConflict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    description TEXT,
+    price REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS items_title_key ON items (title_key, id);
+CREATE INDEX IF NOT EXISTS items_price ON items (price, id);
+CREATE TABLE IF NOT EXISTS id_blocks (
+    name TEXT PRIMARY KEY,
+    next INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = "id, title, description, price, created_at, version"
+
+# SQL 문자열을 상수로 고정해 두면 sqlite3 모듈이 커넥션별로 prepared statement를 캐시해서 재사용한다
+_SELECT_ONE = f"SELECT {_COLUMNS} FROM items WHERE id = ?"
+_INSERT = (
+    "INSERT INTO items (id, title, title_key, description, price, created_at, version) "
+    "VALUES (?, ?, ?, ?, ?, ?, 1)"
+)
+_UPDATE = (
+    "UPDATE items SET title = ?, title_key = ?, description = ?, price = ?, version = ? "
+    "WHERE id = ?"
+)
+_DELETE = "DELETE FROM items WHERE id = ?"
+_NEXT_ID = "SELECT next FROM id_blocks WHERE name = 'items'"
+_RESERVE_IDS = "UPDATE id_blocks SET next = next + ? WHERE name = 'items'"
+
+
+def _to_item(row) -> dict:
+    return {
+        "id": row[0],
+        "title": row[1],
+        "description": row[2],
+        "price": row[3],
+        "created_at": datetime.fromisoformat(row[4]),
+        "version": row[5],
+    }
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # isolation_level=None: 트랜잭션은 writer 스레드가 직접 BEGIN/COMMIT 한다
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, cached_statements=128)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+
+class SQLiteItemRepository(ItemRepository):
+    """WAL 모드 SQLite 저장소
+
+    - 읽기: 커넥션 풀에서 하나 빌려 스레드풀에서 실행 (WAL이라 쓰기와 동시에 읽을 수 있다)
+    - 쓰기: 전용 writer 스레드 하나가 큐에 쌓인 작업을 모아 한 트랜잭션으로 커밋 (group commit)
+
+    여러 uvicorn 워커가 같은 파일을 열어도 SQLite 파일 락으로 직렬화되므로 상태가 공유된다.
+    id는 id_blocks 테이블에서 워커별로 블록을 예약해 나눠주므로 워커끼리 겹치지 않는다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        batch_size: int = 256,
+        batch_wait: float = 0.002,
+        id_block_size: int = 1000,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+
+        self._writer_conn = _connect(path)
+        self._migrate(self._writer_conn)
+
+        # id 예약은 writer 트랜잭션과 별개로 바로 커밋돼야 하므로 커넥션을 따로 둔다
+        self._id_conn = _connect(path)
+        self._ids = BlockIdAllocator(self._reserve_ids, id_block_size)
+
+        self._readers: queue.Queue = queue.Queue()
+        for _ in range(pool_size):
+            conn = _connect(path)
+            conn.execute("PRAGMA query_only = ON")
+            self._readers.put(conn)
+
+        self._writes: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def _migrate(conn):
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+        if "version" not in columns:
+            conn.execute("ALTER TABLE items ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        conn.execute(
+            "INSERT OR IGNORE INTO id_blocks (name, next) "
+            "SELECT 'items', coalesce(max(id), 0) + 1 FROM items"
+        )
+        conn.execute("COMMIT")
+
+    def _reserve_ids(self, n: int) -> int:
+        conn = self._id_conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            start = conn.execute(_NEXT_ID).fetchone()[0]
+            conn.execute(_RESERVE_IDS, (n,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return start
+
+    async def _allocate(self, n: int) -> int:
+        # 남은 블록으로 충분하면 DB까지 가지 않으므로 이벤트 루프에서 바로 처리
+        if self._ids.remaining() >= n:
+            return self._ids.allocate(n)
+        return await asyncio.to_thread(self._ids.allocate, n)
+
+    # --- 읽기 ---
+
+    def _read_sync(self, fn):
+        conn = self._readers.get()
+        try:
+            return fn(conn)
+        finally:
+            self._readers.put(conn)
+
+    async def _read(self, fn):
+        return await asyncio.to_thread(self._read_sync, fn)
+
+    async def get(self, item_id):
+        row = await self._read(lambda conn: conn.execute(_SELECT_ONE, (item_id,)).fetchone())
+        return _to_item(row) if row else None
+
+    async def page(self, title_prefix=None, min_price=None, max_price=None, after=None, limit=None):
+        where, params = [], []
+        if title_prefix is not None:
+            key = title_prefix.casefold()
+            where.append("title_key >= ? AND title_key < ?")
+            params += [key, key + _MAX_CHAR]
+        if min_price is not None:
+            where.append("price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            where.append("price <= ?")
+            params.append(max_price)
+        if after is not None:
+            where.append("id > ?")
+            params.append(after)
+
+        sql = f"SELECT {_COLUMNS} FROM items"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id LIMIT ?"
+        params.append(-1 if limit is None else limit)
+
+        rows = await self._read(lambda conn: conn.execute(sql, params).fetchall())
+        return [_to_item(row) for row in rows]
+
+    async def count(self):
+        return await self._read(lambda conn: conn.execute("SELECT count(*) FROM items").fetchone()[0])
+
+    # --- 쓰기 ---
+
+    async def _write(self, fn):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writes.put((fn, loop, future))
+        return await future
+
+    def _write_loop(self):
+        conn = self._writer_conn
+        while True:
+            op = self._writes.get()
+            if op is None:
+                return
+            batch = [op]
+            # 잠깐 기다리며 뒤따라오는 쓰기를 모아 커밋 한 번으로 처리
+            while len(batch) < self.batch_size:
+                try:
+                    op = self._writes.get(timeout=self.batch_wait)
+                except queue.Empty:
+                    break
+                if op is None:
+                    self._writes.put(None)
+                    break
+                batch.append(op)
+
+            results = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for fn, _, _ in batch:
+                    # 작업 하나가 실패해도 나머지는 커밋되도록 savepoint로 감싼다
+                    conn.execute("SAVEPOINT op")
+                    try:
+                        results.append((fn(conn), None))
+                        conn.execute("RELEASE op")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO op")
+                        conn.execute("RELEASE op")
+                        results.append((None, e))
+                conn.execute("COMMIT")
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                results = [(None, e)] * len(batch)
+
+            for (_, loop, future), (result, error) in zip(batch, results):
+                loop.call_soon_threadsafe(_resolve, future, result, error)
+
+    @staticmethod
+    def _insert(conn, start: int, rows: list[dict]) -> list[dict]:
+        now = datetime.now()
+
+        new_items = [
+            {
+                "id": start + i,
+                "title": data["title"],
+                "description": data.get("description"),
+                "price": data["price"],
+                "created_at": now,
+                "version": 1,
+            }
+            for i, data in enumerate(rows)
+        ]
+        conn.executemany(_INSERT, [
+            (item["id"], item["title"], item["title"].casefold(), item["description"], item["price"], now.isoformat())
+            for item in new_items
+        ])
+        return new_items
+
+    async def add(self, data):
+        return (await self.add_many([data]))[0]
+
+    async def add_many(self, rows):
+        if not rows:
+            return []
+        start = await self._allocate(len(rows))
+        return await self._write(lambda conn: self._insert(conn, start, rows))
+
+    @staticmethod
+    def _update(conn, updates: list[tuple[int, dict]], expected_version: Optional[int] = None) -> list[Optional[dict]]:
+        # 읽기-비교-쓰기가 writer 트랜잭션(BEGIN IMMEDIATE) 안에서 일어나므로 다른 워커와 섞이지 않는다
+        updated = []
+        for item_id, data in updates:
+            row = conn.execute(_SELECT_ONE, (item_id,)).fetchone()
+            if row is None:
+                updated.append(None)
+                continue
+            item = _to_item(row)
+            if expected_version is not None and item["version"] != expected_version:
+                raise VersionConflict(item)
+            # title/price는 None으로 덮어쓰지 않는다 (ItemStore.update와 동일)
+            item.update({k: v for k, v in data.items() if v is not None or k not in ("title", "price")})
+            item["version"] += 1
+            conn.execute(_UPDATE, (
+                item["title"], item["title"].casefold(), item["description"], item["price"], item["version"], item_id,
+            ))
+            updated.append(item)
+        return updated
+
+    async def update(self, item_id, data, expected_version=None):
+        return (await self._write(lambda conn: self._update(conn, [(item_id, data)], expected_version)))[0]
+
+    async def update_many(self, updates):
+        return await self._write(lambda conn: self._update(conn, updates))
+
+    @staticmethod
+    def _delete(conn, item_ids: list[int]) -> list[Optional[dict]]:
+        deleted = []
+        for item_id in item_ids:
+            row = conn.execute(_SELECT_ONE, (item_id,)).fetchone()
+            if row is not None:
+                conn.execute(_DELETE, (item_id,))
+            deleted.append(_to_item(row) if row else None)
+        return deleted
+
+    async def delete(self, item_id):
+        return (await self._write(lambda conn: self._delete(conn, [item_id])))[0]
+
+    async def delete_many(self, item_ids):
+        return await self._write(lambda conn: self._delete(conn, item_ids))
+
+    async def close(self):
+        self._writes.put(None)
+        await asyncio.to_thread(self._writer.join)
+        self._writer_conn.close()
+        self._id_conn.close()
+        while not self._readers.empty():
+            self._readers.get().close()
+
+
+def _resolve(future: asyncio.Future, result, error):
+    if future.cancelled():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,97 @@
+"""감정 분석 백엔드별 지연/처리량/메모리 벤치마크 (CPU)
+
+백엔드마다 새 프로세스에서 모델을 읽고(메모리를 따로 재기 위해) bench/sentiment_testset.txt
+문장들로 묶음 크기별 forward 지연(p50/p99)과 초당 문장 수, 모델을 읽은 뒤 늘어난 최대 RSS를 잰다.
+
+    python -m bench.bench_backends                               # 모든 백엔드
+    python -m bench.bench_backends --backends torch int8 --threads 4 --batches 1 16
+    SENTIMENT_INTEROP_THREADS=1 python -m bench.bench_backends   # 스레드 설정은 환경변수 그대로 전달됨
+
+onnx, onnx-int8은 onnxruntime이 필요하고, 처음 한 번은 ONNX 내보내기 시간이 로딩 시간에 들어간다.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from bench.check_sentiment import load_testset
+from common.stats import percentile
+
+# sentiment_model.BACKENDS와 같음 (이 프로세스는 torch 없이도 돌도록 가져오지 않는다)
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+
+
+def peak_rss_mb() -> float:
+    # 리눅스에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(backend: str, batches: list[int], seconds: float) -> dict:
+    """이 프로세스에서 backend 하나를 재고 결과를 dict로"""
+    from sentiment_model import analyze_batch, load_model
+
+    texts = load_testset()
+    base_rss = peak_rss_mb()
+    started = time.perf_counter()
+    tokenizer, model = load_model(backend)
+    result = {"backend": backend, "load_seconds": time.perf_counter() - started, "batches": {}}
+    analyze_batch(texts[:8], tokenizer, model)  # 워밍업
+
+    for batch_size in batches:
+        samples = []
+        sentences = 0
+        deadline = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < deadline:
+            batch = [texts[(i + k) % len(texts)] for k in range(batch_size)]
+            i += batch_size
+            start = time.perf_counter()
+            analyze_batch(batch, tokenizer, model)
+            samples.append(time.perf_counter() - start)
+            sentences += batch_size
+        result["batches"][batch_size] = {
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "sentences_per_second": sentences / sum(samples),
+        }
+    result["rss_mb"] = peak_rss_mb() - base_rss
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=5.0, help="묶음 크기 하나당 측정 시간")
+    parser.add_argument("--threads", type=int, help="SENTIMENT_THREADS (연산 안 스레드 수)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.batches, args.seconds)))
+        return
+
+    env = dict(os.environ)
+    if args.threads:
+        env["SENTIMENT_THREADS"] = str(args.threads)
+    print(f"스레드 {env.get('SENTIMENT_THREADS', '기본값')}, 묶음 크기 {args.batches}, 문장 {len(load_testset())}개")
+    print(f"{'backend':<11}{'load s':>8}{'RSS MB':>8}{'batch':>7}{'p50 ms':>9}{'p99 ms':>9}{'sent/s':>9}")
+    for backend in args.backends:
+        cmd = [sys.executable, "-m", "bench.bench_backends", "--child", backend,
+               "--seconds", str(args.seconds), "--batches", *map(str, args.batches)]
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            reason = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"종료 코드 {proc.returncode}"
+            print(f"{backend:<11} 실패: {reason}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        for n, (batch_size, b) in enumerate(r["batches"].items()):
+            head = f"{backend:<11}{r['load_seconds']:>8.1f}{r['rss_mb']:>8.0f}" if n == 0 else " " * 27
+            print(f"{head}{batch_size:>7}{b['p50_ms']:>9.1f}{b['p99_ms']:>9.1f}{b['sentences_per_second']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""감정 분석 마이크로배칭 벤치마크 (묶음 크기별 처리량 / p50 / p99)
+
+sentiment_server.MicroBatcher에 동시 클라이언트 여러 개가 한 문장씩 계속 요청을 보내고
+max_batch를 바꿔 가며 초당 문장 수와 문장별 지연(큐 대기 + forward)을 잰다.
+max_batch=1이 기존처럼 한 문장씩 forward 하는 경우다.
+
+    python -m bench.bench_sentiment                            # 실제 모델 (torch, transformers 필요)
+    python -m bench.bench_sentiment --synthetic                # 가짜 모델 (아래 비용 모델로 sleep)
+    python -m bench.bench_sentiment --batches 1 8 32 --clients 64 --seconds 10
+
+--synthetic의 forward 비용 = base_ms + token_ms x 묶음 크기 x 묶음 안 최대 토큰 수
+(토큰 수는 글자 수 / 2로 어림). 실제 CPU에서는 묶음이 커질수록 행렬곱 효율도 좋아지므로
+가짜 모델의 배칭 이득은 고정비(base_ms)를 나누는 만큼만 나타난다.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from common.stats import percentile
+from sentiment_server import MAX_WAIT_MS, MicroBatcher, QueueFull
+
+SENTENCES = [
+    "오늘 정말 기분이 좋아요",
+    "시험 결과가 너무 걱정돼서 잠이 안 와요",
+    "친구가 약속을 또 어겨서 화가 났다",
+    "비 오는 날 창밖을 보니 괜히 마음이 차분해진다",
+    "키우던 강아지가 떠나서 너무 슬퍼요",
+    "새로 산 책이 생각보다 훨씬 재미있어서 밤새 다 읽어 버렸다",
+    "회의 시간에 갑자기 발표를 시켜서 너무 당황스럽고 무서웠어요",
+    "오랜만에 가족들과 저녁을 먹으며 이야기를 나누니 마음이 따뜻해졌다",
+]
+
+
+def synthetic_predict(base_ms: float, token_ms: float):
+    labels = ["Angry", "Fear", "Happy", "Tender", "Sad"]
+
+    def predict(texts):
+        tokens = max(len(text) for text in texts) // 2 + 2
+        time.sleep((base_ms + token_ms * len(texts) * tokens) / 1000)
+        return [labels[len(text) % len(labels)] for text in texts]
+
+    return predict
+
+
+def model_predict():
+    from sentiment_model import analyze_batch, load_model
+
+    tokenizer, model = load_model()
+    return lambda texts: analyze_batch(texts, tokenizer, model)
+
+
+async def run(predict, max_batch: int, max_wait: float, clients: int, seconds: float, queue_size: int) -> dict:
+    batcher = MicroBatcher(predict, max_batch=max_batch, max_wait=max_wait, queue_size=queue_size)
+    batcher.start()
+    latencies = []
+    rejected = 0
+    rng = random.Random(0)
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal rejected
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await batcher.submit([rng.choice(SENTENCES)])
+            except QueueFull:
+                rejected += 1
+                await asyncio.sleep(0.01)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    stats = batcher.stats()
+    await batcher.stop()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "avg_batch": stats["avg_batch"],
+        "rejected": rejected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--clients", type=int, default=32, help="동시에 요청하는 클라이언트 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="묶음 크기 하나당 측정 시간")
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--synthetic", action="store_true", help="모델 대신 비용 모델로 sleep")
+    parser.add_argument("--base-ms", type=float, default=10.0, help="--synthetic: forward 한 번의 고정비")
+    parser.add_argument("--token-ms", type=float, default=0.1, help="--synthetic: 문장 x 토큰 하나당 비용")
+    args = parser.parse_args()
+
+    predict = synthetic_predict(args.base_ms, args.token_ms) if args.synthetic else model_predict()
+    print(f"클라이언트 {args.clients}개, 최대 대기 {args.max_wait_ms}ms, {'가짜 모델' if args.synthetic else '실제 모델'}")
+    print(f"{'max_batch':>9}{'sent/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'avg batch':>11}{'rejected':>10}")
+    for max_batch in args.batches:
+        r = asyncio.run(run(predict, max_batch, args.max_wait_ms / 1000, args.clients, args.seconds, args.queue_size))
+        print(f"{max_batch:>9}{r['throughput']:>9.1f}{r['p50']:>9.1f}{r['p99']:>9.1f}{r['avg_batch']:>11.1f}{r['rejected']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""감정 분석 백엔드 라벨 비교 (fp32 PyTorch 기준)
+
+bench/sentiment_testset.txt 문장들을 fp32 torch 백엔드와 다른 백엔드로 분류해서
+라벨이 얼마나 같은지 확인한다. 일치율이 --min-agreement보다 낮으면 종료 코드 1.
+
+    python -m bench.check_sentiment                          # int8, onnx, onnx-int8 모두
+    python -m bench.check_sentiment --backends int8 --min-agreement 0.95
+"""
+import argparse
+from pathlib import Path
+
+TESTSET = Path(__file__).parent / "sentiment_testset.txt"
+
+
+def load_testset() -> list[str]:
+    lines = TESTSET.read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def classify(backend: str, texts: list[str], batch_size: int) -> list[str]:
+    from sentiment_model import analyze_batch, load_model
+
+    tokenizer, model = load_model(backend)
+    labels = []
+    for i in range(0, len(texts), batch_size):
+        labels += analyze_batch(texts[i:i + batch_size], tokenizer, model)
+    return labels
+
+
+def main():
+    from sentiment_model import BACKENDS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS[1:], default=list(BACKENDS[1:]))
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="fp32 라벨과 같아야 하는 비율")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    texts = load_testset()
+    reference = classify("torch", texts, args.batch_size)
+    failures = 0
+    for backend in args.backends:
+        labels = classify(backend, texts, args.batch_size)
+        diffs = [(text, ref, got) for text, ref, got in zip(texts, reference, labels) if ref != got]
+        agreement = 1 - len(diffs) / len(texts)
+        ok = agreement >= args.min_agreement
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'}  {backend:<10} fp32와 일치 {agreement:.1%} ({len(texts) - len(diffs)}/{len(texts)})")
+        for text, ref, got in diffs:
+            print(f"      {ref:>6} -> {got:<6} {text}")
+
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
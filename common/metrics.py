@@ -0,0 +1,137 @@
+"""FastAPI 앱들이 같이 쓰는 요청 메트릭 (ASGI 미들웨어 + Prometheus 텍스트 포맷)
+
+    metrics = Metrics()
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    @app.get("/metrics")
+    async def get_metrics():
+        return Response(await metrics.render(), media_type=CONTENT_TYPE)
+
+표준 라이브러리만 사용하므로 FastAPI/app, BeautifulSoup 어느 쪽에서든 가져다 쓸 수 있다.
+"""
+import inspect
+import time
+from bisect import bisect_left
+from typing import Callable, Optional
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _RouteStats:
+    """(method, route) 하나의 지연 히스토그램과 상태코드별 카운트
+
+    버킷 배열은 처음 한 번만 만들고, 라벨 문자열도 미리 만들어 둔다.
+    """
+
+    __slots__ = ("labels", "buckets", "sum", "count", "statuses")
+
+    def __init__(self, method: str, route: str, n_buckets: int):
+        self.labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+        self.buckets = [0] * (n_buckets + 1)  # 마지막 칸이 +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.statuses: dict[int, int] = {}
+
+
+class Metrics:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.bucket_bounds = tuple(buckets)
+        self.in_flight = 0
+        self._routes: dict[tuple[str, str], _RouteStats] = {}
+        self._gauges: list[tuple[str, str, Callable]] = []
+
+    def add_gauge(self, name: str, help_text: str, fn: Callable):
+        """render할 때마다 fn()을 호출해서 값을 읽는 gauge (async 함수도 가능)"""
+        self._gauges.append((name, help_text, fn))
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        stats = self._routes.get((method, route))
+        if stats is None:
+            stats = self._routes[(method, route)] = _RouteStats(method, route, len(self.bucket_bounds))
+        stats.buckets[bisect_left(self.bucket_bounds, seconds)] += 1
+        stats.sum += seconds
+        stats.count += 1
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    async def render(self) -> str:
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for stats in self._routes.values():
+            cumulative = 0
+            for bound, count in zip(self.bucket_bounds, stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{stats.labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{stats.labels},le="+Inf"}} {stats.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{stats.labels}}} {stats.sum}")
+            lines.append(f"http_request_duration_seconds_count{{{stats.labels}}} {stats.count}")
+
+        lines += [
+            "# HELP http_responses_total Responses by route and status code.",
+            "# TYPE http_responses_total counter",
+        ]
+        for stats in self._routes.values():
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'http_responses_total{{{stats.labels},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        for name, help_text, fn in self._gauges:
+            value = fn()
+            if inspect.isawaitable(value):
+                value = await value
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+        return "\n".join(lines) + "\n"
+
+
+def _route_name(scope) -> str:
+    # 실제 경로(/items/3) 대신 라우트 템플릿(/items/{item_id})을 써서 라벨 수가 늘어나지 않게 한다
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        return getattr(endpoint, "__name__", "<endpoint>")
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """요청마다 지연시간, 상태코드, 동시 처리 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app, metrics: Optional[Metrics] = None):
+        self.app = app
+        self.metrics = metrics or Metrics()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(scope["method"], _route_name(scope), status, time.perf_counter() - start)
@@ -0,0 +1,8 @@
+"""벤치마크 스크립트들이 같이 쓰는 통계 함수 (FastAPI/app, BeautifulSoup, 저장소 루트의 bench)"""
+
+
+def percentile(samples, q):
+    """q 백분위 값 (가장 가까운 순위, 0 <= q <= 100)"""
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[k]
@@ -0,0 +1,289 @@
+"""대량 감정 분석 CLI (CSV / JSONL 리뷰 파일 -> 라벨 + 클래스별 확률)
+
+    python sentiment_batch.py reviews.csv --out labeled.csv --text-field review
+    python sentiment_batch.py reviews.jsonl.gz --out labeled.jsonl --workers 4 --batch-size 64
+
+- 입력을 --chunk-size 행씩 읽어서 처리하고 바로 출력에 쓴다 (파일 전체를 메모리에 올리지 않음)
+- 덩어리 안에서 토큰 수로 정렬해 길이가 비슷한 문장끼리 묶는다 (패딩 감소). 출력 순서는 입력 순서 그대로
+- --workers N이면 프로세스 N개가 각자 모델을 읽어서 덩어리를 나눠 처리한다 (연산 스레드는 코어 수 / N)
+- 덩어리를 쓸 때마다 <out>.progress에 처리한 행 수와 출력 크기를 남긴다. 중간에 멈춰도 같은 명령을
+  다시 실행하면 출력을 마지막 완성된 덩어리까지 자르고 그다음 행부터 이어서 한다
+- <out>.progress에는 입력 파일의 경로/크기/수정 시각도 남겨서 입력이 바뀌었으면 이어하지 않고 멈춘다.
+  끝까지 처리하면 <out>.progress를 지우므로 같은 --out으로 다시 실행하면 처음부터 다시 만든다
+- 진행 중에 sentences/s와 패딩 효율(실제 토큰 / 패딩 포함 토큰)을 표준에러로 출력한다
+
+출력 행 = 입력 행 + label + 클래스별 확률 (CSV: prob_Angry, ... 열 / JSONL: "probs" 객체)
+텍스트가 비어 있는 행은 label과 확률이 비어 있다. 백엔드는 SENTIMENT_BACKEND로 고른다 (sentiment_model.py).
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterator, Optional
+
+# sentiment_model.EMOTION_LABELS 순서 (부모 프로세스는 torch를 읽지 않도록 가져오지 않는다)
+LABELS = ("Angry", "Fear", "Happy", "Tender", "Sad")
+
+
+def open_text(path: str, mode: str = "rt"):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def file_format(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "jsonl"
+
+
+def input_fingerprint(path: str) -> dict:
+    """이어하기 전에 입력이 같은지 비교하는 값 (표준입력은 확인할 수 없어서 경로만)"""
+    if path == "-":
+        return {"path": "-"}
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_rows(path: str, fmt: str) -> Iterator[dict]:
+    f = open_text(path)
+    try:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+class Scorer:
+    """문장 목록 -> 확률 dict 목록 (길이 버킷으로 묶어서 배치 추론)"""
+
+    def __init__(self, batch_size: int, sort: bool = True):
+        from sentiment_model import load_model
+
+        self.tokenizer, self.model = load_model()
+        self.batch_size = batch_size
+        self.sort = sort
+
+    def score(self, texts: list) -> tuple[list, int, int]:
+        """(texts 순서대로의 확률 dict 또는 None, 실제 토큰 수, 패딩 포함 토큰 수)"""
+        from sentiment_model import MAX_LENGTH, score_encoded
+
+        results: list[Optional[dict]] = [None] * len(texts)
+        todo = [i for i, text in enumerate(texts) if text]
+        if not todo:
+            return results, 0, 0
+        encoded = self.tokenizer([texts[i] for i in todo], truncation=True, max_length=MAX_LENGTH)
+        features = [{key: encoded[key][n] for key in encoded.keys()} for n in range(len(todo))]
+        lengths = [len(feature["input_ids"]) for feature in features]
+        order = sorted(range(len(todo)), key=lengths.__getitem__) if self.sort else list(range(len(todo)))
+
+        real = padded = 0
+        for start in range(0, len(order), self.batch_size):
+            bucket = order[start:start + self.batch_size]
+            probs = score_encoded([features[n] for n in bucket], self.tokenizer, self.model)
+            for n, p in zip(bucket, probs):
+                results[todo[n]] = p
+            real += sum(lengths[n] for n in bucket)
+            padded += max(lengths[n] for n in bucket) * len(bucket)
+        return results, real, padded
+
+
+# --workers > 1 일 때 각 프로세스의 Scorer
+_scorer: Optional[Scorer] = None
+
+
+def _init_worker(batch_size: int, sort: bool, threads: int):
+    global _scorer
+    # torch/onnxruntime를 읽기 전에 스레드 수를 정해야 적용된다
+    os.environ["SENTIMENT_THREADS"] = str(threads)
+    _scorer = Scorer(batch_size, sort)
+
+
+def _score_in_worker(texts: list):
+    return _scorer.score(texts)
+
+
+class Progress:
+    def __init__(self, skipped: int = 0):
+        self.started = time.perf_counter()
+        self.skipped = skipped
+        self.rows = 0
+        self.scored = 0
+        self.real_tokens = 0
+        self.padded_tokens = 0
+
+    def add(self, rows: int, scored: int, real: int, padded: int):
+        self.rows += rows
+        self.scored += scored
+        self.real_tokens += real
+        self.padded_tokens += padded
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        efficiency = self.real_tokens / self.padded_tokens if self.padded_tokens else 1.0
+        return (
+            f"{self.skipped + self.rows}행 (이번 실행 {self.rows}) "
+            f"{self.scored / elapsed:.1f} sentences/s, 패딩 효율 {efficiency:.0%}, {elapsed:.0f}초"
+        )
+
+
+class LabeledWriter:
+    """라벨 붙은 행을 출력 파일에 쓰고, 덩어리마다 <out>.progress에 (처리한 행 수, 출력 바이트, 입력)을 남긴다"""
+
+    def __init__(self, out: Path, fmt: str, source: dict):
+        self.out = out
+        self.fmt = fmt
+        self.source = source
+        self.progress_path = out.with_name(out.name + ".progress")
+        self.rows_done = 0
+        offset = 0
+        if self.progress_path.exists() and out.exists():
+            state = json.loads(self.progress_path.read_text(encoding="utf-8"))
+            if state.get("input") != source:
+                raise SystemExit(
+                    f"{self.progress_path}는 다른 입력({state.get('input')})을 처리하던 기록입니다. "
+                    "--out을 바꾸거나 이 파일을 지우고 다시 실행하세요"
+                )
+            self.rows_done, offset = state["rows"], state["bytes"]
+        # 마지막 기록 이후에 쓰다 만 부분은 잘라낸다
+        self._file = open(out, "r+b" if offset else "wb")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        self._fields: Optional[list] = None
+        self._header_written = offset > 0
+
+    def write_chunk(self, rows: list, scores: list):
+        buf = io.StringIO()
+        if self.fmt == "csv":
+            if self._fields is None:
+                self._fields = list(rows[0].keys()) + ["label"] + [f"prob_{label}" for label in LABELS]
+            writer = csv.DictWriter(buf, self._fields, extrasaction="ignore", lineterminator="\n")
+            if not self._header_written:
+                writer.writeheader()
+                self._header_written = True
+            for row, probs in zip(rows, scores):
+                extra = {"label": max(probs, key=probs.get)} if probs else {}
+                if probs:
+                    extra.update({f"prob_{label}": round(p, 6) for label, p in probs.items()})
+                writer.writerow({**row, **extra})
+        else:
+            for row, probs in zip(rows, scores):
+                record = {
+                    **row,
+                    "label": max(probs, key=probs.get) if probs else None,
+                    "probs": {label: round(p, 6) for label, p in probs.items()} if probs else None,
+                }
+                buf.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        self._file.write(buf.getvalue().encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.rows_done += len(rows)
+        tmp = self.progress_path.with_name(self.progress_path.name + ".tmp")
+        state = {"rows": self.rows_done, "bytes": self._file.tell(), "input": self.source}
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.progress_path)
+
+    def finish(self):
+        """끝까지 처리했으면 이어하기 기록을 지운다"""
+        self.progress_path.unlink(missing_ok=True)
+
+    def close(self):
+        self._file.close()
+
+
+def chunks(rows: Iterator[dict], size: int) -> Iterator[list]:
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def run(args) -> Progress:
+    in_fmt = args.input_format or file_format(args.source)
+    out_fmt = file_format(args.out)
+    if args.out.endswith(".gz"):
+        raise SystemExit("출력은 압축하지 않은 .csv / .jsonl만 됩니다 (이어하기 위해 파일을 잘라야 하므로)")
+    writer = LabeledWriter(Path(args.out), out_fmt, input_fingerprint(args.source))
+    if writer.rows_done:
+        print(f"체크포인트: 앞의 {writer.rows_done}행은 이미 처리됐습니다. 이어서 합니다", file=sys.stderr)
+    progress = Progress(writer.rows_done)
+    rows = islice(read_rows(args.source, in_fmt), writer.rows_done, None)
+    last_report = time.perf_counter()
+
+    def text_of(row: dict) -> str:
+        return (row.get(args.text_field) or "").strip()
+
+    def finish(chunk: list, result):
+        nonlocal last_report
+        scores, real, padded = result
+        writer.write_chunk(chunk, scores)
+        progress.add(len(chunk), sum(s is not None for s in scores), real, padded)
+        if time.perf_counter() - last_report >= args.report_every:
+            print(progress.line(), file=sys.stderr)
+            last_report = time.perf_counter()
+
+    try:
+        if args.workers <= 1:
+            scorer = Scorer(args.batch_size, args.sort)
+            for chunk in chunks(rows, args.chunk_size):
+                finish(chunk, scorer.score([text_of(row) for row in chunk]))
+        else:
+            threads = args.threads or int(os.getenv("SENTIMENT_THREADS", "0")) or max(1, (os.cpu_count() or 1) // args.workers)
+            with ProcessPoolExecutor(
+                args.workers, mp_context=get_context("spawn"),
+                initializer=_init_worker, initargs=(args.batch_size, args.sort, threads),
+            ) as pool:
+                # 앞 덩어리부터 순서대로 쓰고, 진행 중인 덩어리는 워커 수 x 2개까지만 (입력을 다 읽어 두지 않음)
+                window: deque = deque()
+                for chunk in chunks(rows, args.chunk_size):
+                    window.append((chunk, pool.submit(_score_in_worker, [text_of(row) for row in chunk])))
+                    if len(window) >= args.workers * 2:
+                        chunk, future = window.popleft()
+                        finish(chunk, future.result())
+                while window:
+                    chunk, future = window.popleft()
+                    finish(chunk, future.result())
+        writer.finish()
+    finally:
+        writer.close()
+    print(f"완료: {progress.line()} -> {args.out}", file=sys.stderr)
+    return progress
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="입력 CSV / JSONL 파일 (.gz 가능, - 이면 표준입력)")
+    parser.add_argument("--out", required=True, help="출력 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("--text-field", default="text", help="문장이 든 열/필드 이름")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="확장자로 알 수 없을 때 (표준입력 등)")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="한 번에 읽어서 길이순으로 묶는 행 수")
+    parser.add_argument("--batch-size", type=int, default=32, help="forward 한 번의 문장 수")
+    parser.add_argument("--sort", action=argparse.BooleanOptionalAction, default=True, help="덩어리 안 길이순 정렬")
+    parser.add_argument("--workers", type=int, default=1, help="추론 프로세스 수")
+    parser.add_argument("--threads", type=int, help="--workers > 1일 때 워커 하나의 연산 스레드 수 (기본: 코어 수 / workers)")
+    parser.add_argument("--report-every", type=float, default=5.0, help="진행 상황 출력 간격(초)")
+    args = parser.parse_args()
+
+    try:
+        run(args)
+    except KeyboardInterrupt:
+        print("중단됨: 완성된 덩어리까지 기록했습니다. 다시 실행하면 이어서 처리합니다.", file=sys.stderr)
+        raise SystemExit(130)
+
+
+if __name__ == "__main__":
+    main_cli()
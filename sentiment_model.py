@@ -0,0 +1,169 @@
+"""한국어 감정 분류 모델 (KoBERT 토크나이저 + rkdaldus/ko-sent5-classification)
+
+Streamlit 앱(김우진_AI_3주차 과제.py)과 추론 서버(sentiment_server.py)가 같이 쓴다.
+
+CPU 추론 백엔드는 SENTIMENT_BACKEND 환경변수(또는 load_model(backend=...))로 고른다.
+- torch:      원래 fp32 PyTorch 모델
+- int8:       PyTorch 동적 양자화 (nn.Linear 가중치를 int8로, 활성값은 실행 중 양자화)
+- onnx:       ONNX로 내보내서 ONNX Runtime으로 실행 (onnxruntime 필요)
+- onnx-int8:  내보낸 ONNX 모델을 ONNX Runtime 동적 양자화로 int8 변환해서 실행
+
+SENTIMENT_THREADS / SENTIMENT_INTEROP_THREADS로 연산 안/연산 사이 스레드 수를 정한다 (기본: 라이브러리 기본값).
+fp32와 라벨이 같은지는 bench/check_sentiment.py, 속도/메모리는 bench/bench_backends.py로 확인한다.
+"""
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+TOKENIZER_NAME = "monologg/kobert"
+MODEL_NAME = "rkdaldus/ko-sent5-classification"
+
+EMOTION_LABELS = {
+    0: "Angry",
+    1: "Fear",
+    2: "Happy",
+    3: "Tender",
+    4: "Sad",
+}
+
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")
+THREADS = int(os.getenv("SENTIMENT_THREADS", "0"))  # 0이면 라이브러리 기본값
+INTEROP_THREADS = int(os.getenv("SENTIMENT_INTEROP_THREADS", "0"))
+# 문장당 최대 토큰 수 (넘으면 자른다). Streamlit 앱, 추론 서버, 대량 처리 CLI가 모두 이 값을 쓰므로
+# 같은 문장은 어느 경로로 보내도 같은 라벨이 나온다. 기본값은 BERT 위치 임베딩 한도
+MAX_LENGTH = int(os.getenv("SENTIMENT_MAX_LENGTH", "512"))
+# 내보낸 ONNX 파일을 두는 곳 (처음 한 번만 내보내고 다음부터는 그대로 읽음)
+ONNX_DIR = Path(os.getenv("SENTIMENT_ONNX_DIR", Path(__file__).resolve().parent / "onnx_models"))
+
+
+class OnnxSentimentModel:
+    """ONNX Runtime 세션을 PyTorch 모델처럼 model(**inputs).logits로 부를 수 있게 감싼 것"""
+
+    def __init__(self, path: Path, threads: int = 0, interop_threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        if interop_threads:
+            options.inter_op_num_threads = interop_threads
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def __call__(self, **inputs):
+        feed = {name: tensor.numpy() for name, tensor in inputs.items() if name in self.input_names}
+        (logits,) = self.session.run(["logits"], feed)
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def _tmp_path(path: Path) -> Path:
+    # sentiment_batch --workers N의 워커들이 처음 실행에서 동시에 내보낼 수 있으므로 프로세스마다 다른 임시 파일에 쓴다
+    # (각자 완성한 파일을 os.replace로 옮기므로 누가 마지막이든 완전한 모델 하나만 남는다)
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+def export_onnx(tokenizer, model, path: Path):
+    """배치 크기와 문장 길이를 가변 축으로 두고 ONNX로 내보낸다"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sample = tokenizer(["감정 분석 예시 문장", "예시"], return_tensors="pt", padding=True)
+    names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    tmp = _tmp_path(path)
+    torch.onnx.export(
+        model,
+        tuple(sample[name] for name in names),
+        str(tmp),
+        input_names=names,
+        output_names=["logits"],
+        dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in names}, "logits": {0: "batch"}},
+        opset_version=17,
+        # TorchScript 내보내기: 가중치까지 파일 하나에 들어가고 ONNX Runtime 양자화 도구와도 잘 맞는다
+        dynamo=False,
+    )
+    os.replace(tmp, path)
+
+
+def quantize_onnx(src: Path, dst: Path):
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp = _tmp_path(dst)
+    # 경로를 넘기면 ONNX Runtime이 src 옆의 고정된 이름(<src>-inferred.onnx)에 중간 파일을 쓰므로
+    # 읽어 둔 모델을 넘긴다 (중간 파일은 프로세스마다 따로 만든 임시 디렉터리에 생긴다)
+    quantize_dynamic(onnx.load(str(src)), str(tmp), weight_type=QuantType.QInt8)
+    os.replace(tmp, dst)
+
+
+def set_threads(threads: int = THREADS, interop_threads: int = INTEROP_THREADS):
+    if threads:
+        torch.set_num_threads(threads)
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # 병렬 작업이 한 번이라도 돈 뒤에는 바꿀 수 없다 (프로세스 시작 직후에만 가능)
+            pass
+
+
+def load_model(backend: str = None):
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 SENTIMENT_BACKEND: {backend} (가능한 값: {', '.join(BACKENDS)})")
+    set_threads()
+
+    tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_NAME, trust_remote_code=True)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+    # 둘 다 허깅페이스에 올라와있는 tokenizer와 model
+    model.eval()
+
+    if backend == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif backend.startswith("onnx"):
+        fp32_path = ONNX_DIR / f"{MODEL_NAME.replace('/', '--')}.onnx"
+        if not fp32_path.exists():
+            export_onnx(tokenizer, model, fp32_path)
+        path = fp32_path
+        if backend == "onnx-int8":
+            path = fp32_path.with_name(fp32_path.stem + ".int8.onnx")
+            if not path.exists():
+                quantize_onnx(fp32_path, path)
+        model = OnnxSentimentModel(path, THREADS, INTEROP_THREADS)
+    return tokenizer, model
+
+
+def _forward(inputs, model):
+    with torch.inference_mode():
+        outputs = model(**inputs)
+        # logits는 모델이 각 감정 클래스에 대해 얼마나 "그쪽일 확률이 높다고 생각하는지" 나타내는 점수
+        # inference_mode: no_grad보다 가볍다 (autograd 기록과 버전 카운터를 아예 건너뜀)
+    return outputs.logits
+
+
+def analyze_batch(texts, tokenizer, model, max_length=MAX_LENGTH):
+    """여러 문장을 한 번에: 가장 긴 문장 길이로 한 번만 패딩하고 forward 한 번"""
+    inputs = tokenizer(list(texts), return_tensors="pt", padding=True, truncation=True, max_length=max_length)
+    # 입력 텍스트를 모델이 이해할 수 있는 숫자 형태로 변환하는 단계
+    # tokenizer: 문장을 단어 단위로 자르고 숫자로 바꿔주는 도구
+    # return_tensors="pt": PyTorch 텐서(torch.Tensor) 형태로 리턴하라는 뜻
+    # padding=True: 짧은 문장은 뒤를 [PAD]로 채워서 묶음 안의 길이를 맞춘다 (attention_mask로 무시됨)
+    predicted = torch.argmax(_forward(inputs, model), dim=1).tolist()
+    # torch.argmax(tensor, dim=1) : 각 행(문장)에서 가장 큰 값의 인덱스
+    return [EMOTION_LABELS[label] for label in predicted]
+
+
+def score_encoded(features, tokenizer, model):
+    """이미 토큰화된 문장들(tokenizer(..., padding=False)의 행 dict 목록)의 클래스별 확률
+
+    길이가 비슷한 문장끼리 모아서 부르면 패딩이 줄어든다 (sentiment_batch.py).
+    """
+    inputs = tokenizer.pad(list(features), return_tensors="pt")
+    probs = torch.softmax(_forward(inputs, model).float(), dim=1).tolist()
+    return [dict(zip(EMOTION_LABELS.values(), row)) for row in probs]
+
+
+def analyze_sentiment(text, tokenizer, model):
+    return analyze_batch([text], tokenizer, model)[0]
@@ -0,0 +1,228 @@
+"""감정 분석 추론 서버 (동적 마이크로배칭)
+
+    python sentiment_server.py                     # 0.0.0.0:8100
+    uvicorn sentiment_server:app --port 8100
+
+POST /sentiment  {"text": "..."} 또는 {"texts": ["...", ...]}  ->  {"labels": [...]}
+
+- 요청 문장을 큐에 모았다가 SENTIMENT_MAX_BATCH개가 차거나 첫 문장이 들어온 뒤
+  SENTIMENT_MAX_WAIT_MS가 지나면 한 번에 패딩해서 forward 한 번으로 처리한다
+- 큐(SENTIMENT_QUEUE_SIZE 문장)가 가득 차면 기다리게 하지 않고 바로 503 + Retry-After (백프레셔)
+- forward는 전용 스레드 하나에서 돈다 (torch가 연산 안에서 여러 코어를 쓴다)
+"""
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from common.metrics import CONTENT_TYPE, Metrics, MetricsMiddleware
+
+MAX_BATCH = int(os.getenv("SENTIMENT_MAX_BATCH", "16"))
+MAX_WAIT_MS = float(os.getenv("SENTIMENT_MAX_WAIT_MS", "10"))
+QUEUE_SIZE = int(os.getenv("SENTIMENT_QUEUE_SIZE", "256"))
+
+
+class QueueFull(Exception):
+    """큐에 자리가 없음 (호출한 쪽이 잠시 뒤 다시 시도해야 함)"""
+
+
+class MicroBatcher:
+    """문장 단위 요청을 모아서 predict(texts) 한 번으로 처리하는 동적 배처
+
+    - 첫 문장이 들어오면 max_wait초 동안(또는 max_batch개가 찰 때까지) 더 모은다
+    - forward가 도는 동안 들어온 문장은 다음 묶음으로 바로 모인다 (부하가 클수록 묶음이 커짐)
+    - 큐 상한(queue_size)을 넘는 submit은 기다리지 않고 QueueFull
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[list], list],
+        max_batch: int = MAX_BATCH,
+        max_wait: float = MAX_WAIT_MS / 1000,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        self.predict = predict
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self.forward_seconds = 0.0
+        self.latencies: deque = deque(maxlen=10000)
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("서버 종료 중"))
+        self._executor.shutdown(wait=False)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, texts: List[str]) -> list:
+        """texts 전체를 큐에 넣고 결과를 순서대로 기다린다 (자리가 모자라면 하나도 넣지 않고 QueueFull)"""
+        if self.queue_depth() + len(texts) > self.queue_size:
+            self.rejected += 1
+            raise QueueFull()
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future, submitted))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # 기다리다 연결이 끊긴 요청은 계산하지 않는다
+        return [entry for entry in batch if not entry[1].done()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self.predict, [text for text, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+            self.batches += 1
+            self.items += len(batch)
+            self.forward_seconds += finished - started
+            for (_, future, submitted), result in zip(batch, results):
+                self.latencies.append(finished - submitted)
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": self.items / self.batches if self.batches else 0.0,
+            "rejected": self.rejected,
+            "queue_depth": self.queue_depth(),
+            "forward_seconds": self.forward_seconds,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+        }
+
+
+def load_predict() -> Callable[[list], list]:
+    """sentiment_model을 읽어서 predict(texts) -> 감정 라벨 목록을 만든다 (torch, transformers 필요)"""
+    from sentiment_model import analyze_batch, load_model
+
+    tokenizer, model = load_model()
+    return lambda texts: analyze_batch(texts, tokenizer, model)
+
+
+batcher: Optional[MicroBatcher] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global batcher
+    predict = await asyncio.to_thread(load_predict)
+    batcher = MicroBatcher(predict)
+    batcher.start()
+    yield
+    await batcher.stop()
+
+
+app = FastAPI(title="Sentiment Inference Server", lifespan=lifespan)
+
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+for _name, _help in (
+    ("batches", "Forward passes run."),
+    ("items", "Sentences classified."),
+    ("avg_batch", "Average sentences per forward pass."),
+    ("rejected", "Requests rejected because the queue was full."),
+    ("queue_depth", "Sentences waiting for a batch."),
+    ("p99_ms", "p99 queue + forward latency of recent sentences (ms)."),
+):
+    metrics.add_gauge(f"sentiment_{_name}", _help, lambda name=_name: batcher.stats()[name] if batcher else 0)
+
+
+class SentimentRequest(BaseModel):
+    text: Optional[str] = None
+    texts: Optional[List[str]] = None
+
+
+class SentimentResponse(BaseModel):
+    labels: List[str]
+
+
+@app.post("/sentiment", response_model=SentimentResponse)
+async def sentiment(request: SentimentRequest):
+    texts = request.texts if request.texts is not None else ([request.text] if request.text is not None else [])
+    if not texts:
+        raise HTTPException(status_code=422, detail="text 또는 texts가 필요합니다")
+    if len(texts) > batcher.queue_size:
+        raise HTTPException(status_code=413, detail=f"한 요청에 최대 {batcher.queue_size}문장까지 보낼 수 있습니다")
+    try:
+        labels = await batcher.submit(texts)
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="요청이 많습니다. 잠시 뒤 다시 시도하세요", headers={"Retry-After": "1"})
+    return SentimentResponse(labels=labels)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", **(batcher.stats() if batcher else {})}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(await metrics.render(), media_type=CONTENT_TYPE)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("SENTIMENT_PORT", "8100")))
@@ -1,41 +1,14 @@
 import streamlit as st
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
 from datetime import datetime
+import sentiment_model
+from sentiment_model import analyze_sentiment
 
 st.set_page_config(page_title="한국어 감정 분석", layout="wide")
 
 @st.cache_resource
 def load_model():
-    tokenizer = AutoTokenizer.from_pretrained("monologg/kobert", trust_remote_code=True)
-    model = AutoModelForSequenceClassification.from_pretrained("rkdaldus/ko-sent5-classification")
-    # 둘 다 허깅페이스에 올라와있는 tokenizer와 model
-    return tokenizer, model
-
-def analyze_sentiment(text, tokenizer, model):
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-    # 입력 텍스트를 모델이 이해할 수 있는 숫자 형태로 변환하는 단계
-    # tokenizer: 문장을 단어 단위로 자르고 숫자로 바꿔주는 도구
-    # return_tensors="pt": PyTorch 텐서(torch.Tensor) 형태로 리턴하라는 뜻
-    # input_ids : 각 단어를 숫자로 바꾼 결과 (문장 내용)
-    with torch.no_grad():
-        outputs = model(**inputs)
-        # 모델에 입력을 넣어 예측(logits) 을 얻는 단계
-        # **를 쓰면 딕셔너리였던 inputs가 input_ids=... , token_type_ids=..., attention_mask=... 형태로 자동 전달
-        # logits는 모델이 각 감정 클래스에 대해 얼마나 "그쪽일 확률이 높다고 생각하는지" 나타내는 점수
-    predicted_label = torch.argmax(outputs.logits, dim=1).item()
-    # torch.argmax(tensor, dim=1) : 각 행에서 가장 큰 값의 인덱스를 반환
-    # 이 결과는 텐서이므로 .item()으로 파이썬 숫자로
-
-    emoticon_labels={
-        0:"Angry",
-        1:"Fear",
-        2:"Happy",
-        3:"Tender",
-        4:"Sad"
-    }
-
-    return emoticon_labels[predicted_label]
+    # 모델 코드는 sentiment_model.py에 있다 (추론 서버 sentiment_server.py와 같이 씀)
+    return sentiment_model.load_model()
 
 if 'history' not in st.session_state:
     st.session_state.history = []